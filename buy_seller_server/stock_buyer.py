@@ -1,25 +1,55 @@
+import atexit
 import json
+import logging
 import time
 import threading
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_EVEN
 from flask import Flask, request, jsonify
 import math
 from queue import Queue
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 import uuid
 import flask_cors
 import requests
+from requests.adapters import HTTPAdapter
 import urllib3
+from urllib3.util.retry import Retry
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
-@dataclass
+JSON_HEADERS = {'Content-Type': 'application/json'}
+
+# Background lookups (e.g. contract details) that can overlap with waiting on fills
+prefetch_pool = ThreadPoolExecutor(max_workers=4)
+
+
+def _json_loads(data):
+    """Parse a JSON response body, using orjson when available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj) -> bytes:
+    """Serialize a request body, using orjson when available"""
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+
+@dataclass(slots=True)
 class SellStopOrder:
     price: float
     shares: float
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     ticker: str
     shares: float
@@ -34,36 +64,138 @@ class Trade:
             self.trade_id = str(uuid.uuid4())
 
 class IBWebAPI:
+    AUTH_STATUS_TTL = 15  # seconds
+    TICKLE_INTERVAL = 60  # seconds
+
     def __init__(self, base_url="https://localhost:5050/v1/api"):
         self.base_url = base_url
+        self._accounts_url = f"{base_url}/iserver/accounts"
+        self._auth_status_url = f"{base_url}/iserver/auth/status"
+        self._search_url = f"{base_url}/iserver/secdef/search"
+        self._info_url_tpl = base_url + "/iserver/secdef/info?conid={}"
+        self._orders_url_tpl = base_url + "/iserver/account/{}/orders"
+        self._reply_url_tpl = base_url + "/iserver/reply/{}"
+        self._tickle_url = f"{base_url}/tickle"
         self.session = requests.Session()
         self.session.verify = False
         self.session.timeout = 30
 
+        # Keep enough pooled keep-alive connections for bursts of orders/confirmations.
+        # Retry only covers idempotent methods (urllib3 default), so order POSTs are never resent.
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            pool_block=False,
+            max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({'Connection': 'keep-alive', 'Accept-Encoding': 'gzip'})
+
+        # Lookup caches - account and conid rarely change within a session
+        self._account_id = None
+        self._conid_cache: Dict[str, int] = {}
+        self._auth_cache: Optional[tuple] = None  # (monotonic timestamp, authenticated)
+        self._tick_cache: Dict[int, Decimal] = {}  # conid -> priceIncrement, static per contract
+
+        # Keep the gateway session alive between trades so orders don't hit an expired login
+        self._tickle_stop = threading.Event()
+        self._tickle_thread = threading.Thread(target=self._tickle_loop, daemon=True)
+        self._tickle_thread.start()
+        atexit.register(self.close)
+
+    def _tickle_loop(self):
+        """Ping /tickle every TICKLE_INTERVAL seconds until close() is called"""
+        while not self._tickle_stop.wait(self.TICKLE_INTERVAL):
+            try:
+                response = self.session.post(self._tickle_url, timeout=10)
+                self._check_auth(response)
+                response.close()
+            except Exception as e:
+                logger.warning("Tickle failed: %s", e)
+
+    def close(self):
+        """Stop the keepalive thread"""
+        self._tickle_stop.set()
+
+    def _invalidate_caches(self):
+        """Drop cached lookups so they are refetched after re-authentication"""
+        self._account_id = None
+        self._conid_cache.clear()
+        self._auth_cache = None
+
+    def _check_auth(self, response):
+        """Invalidate caches when the gateway reports the session is not authenticated"""
+        if response.status_code in (401, 403):
+            self._invalidate_caches()
+
+    def _get_account_id(self):
+        """Get the selected account ID, fetching /iserver/accounts only once"""
+        if self._account_id is not None:
+            return self._account_id
+
+        response = self.session.get(self._accounts_url, timeout=10)
+        if response.status_code != 200:
+            self._check_auth(response)
+            logger.error("Failed to get accounts: %s", response.status_code)
+            return None
+
+        self._account_id = _json_loads(response.content).get('selectedAccount')
+        return self._account_id
+
     def get_contract_details(self, conid):
         """Get contract details for a given conid"""
         try:
-            url = f"{self.base_url}/iserver/secdef/info?conid={conid}"
+            url = self._info_url_tpl.format(conid)
             response = self.session.get(url, timeout=30)
             if response.status_code == 200:
-                return response.json()
+                return _json_loads(response.content)
+            self._check_auth(response)
             print(f"❌ Failed to get contract details for conid {conid}: {response.status_code}, {response.text}")
             return None
         except Exception as e:
             print(f"❌ Contract details error: {str(e)}")
             return None
         
-    def is_connected(self):
+    def get_price_increment(self, conid, default=Decimal('0.01')):
+        """Get the tick size for a conid as a Decimal, fetching contract details only the first time"""
+        increment = self._tick_cache.get(conid)
+        if increment is not None:
+            return increment
+
+        details = self.get_contract_details(conid)
+        if not details:
+            return default
+        increment = Decimal(str(details.get('priceIncrement', default)))
+        self._tick_cache[conid] = increment
+        return increment
+        
+    def is_connected(self, force=False):
+        """Check authentication status, reusing a recent result unless force is set"""
+        if not force and self._auth_cache and time.monotonic() - self._auth_cache[0] < self.AUTH_STATUS_TTL:
+            return self._auth_cache[1]
+
         try:
-            response = self.session.get(f"{self.base_url}/iserver/auth/status", timeout=10)
-            return response.status_code == 200 and response.json().get('authenticated', False)
+            # Stream so a failed check never downloads the body; close() returns the connection to the pool
+            response = self.session.get(self._auth_status_url, timeout=10, stream=True)
+            if response.status_code == 200:
+                authenticated = _json_loads(response.content).get('authenticated', False)
+            else:
+                self._check_auth(response)
+                response.close()
+                authenticated = False
         except:
+            self._auth_cache = None
             return False
+
+        # Only a positive result is cached so a fresh login is picked up immediately
+        self._auth_cache = (time.monotonic(), True) if authenticated else None
+        return authenticated
         
     def get_accounts(self):
         """Get account information"""
         try:
-            response = self.session.get(f"{self.base_url}/iserver/accounts", timeout=10)
+            response = self.session.get(self._accounts_url, timeout=10)
             print(f"   📊 Accounts response: {response.status_code}")
             if response.status_code == 200:
                 print(f"   📊 Accounts: {response.json()}")
@@ -74,61 +206,122 @@ class IBWebAPI:
             print(f"   ❌ Get accounts error: {str(e)}")
             return None
     
+    def _build_order(self, account_id, order_spec):
+        """Build a single /orders entry from an order spec"""
+        order = {
+            "acctId": account_id,
+            "conid": int(order_spec["conid"]),  # Ensure it's an integer
+            "orderType": order_spec["orderType"],
+            "side": order_spec["side"],
+            "quantity": order_spec["quantity"],
+            "tif": order_spec.get("tif", "DAY")  # Default to DAY if not provided
+        }
+        
+        # Only add price fields if they exist
+        if order_spec.get("price") is not None:
+            order["price"] = order_spec["price"]
+        if order_spec.get("auxPrice") is not None:
+            order["auxPrice"] = order_spec["auxPrice"]
+        return order
+    
+    def _confirm_order(self, result, max_confirmations=3):
+        """Answer IB confirmation prompts for one order and extract its order ID"""
+        current_result = result
+        confirmation_count = 0
+        
+        while isinstance(current_result, dict) and 'id' in current_result and confirmation_count < max_confirmations:
+            confirmation_id = current_result['id']
+            logger.info("Confirmation required. Sending reply to ID: %s", confirmation_id)
+            reply_response = self.session.post(
+                self._reply_url_tpl.format(confirmation_id),
+                data=_json_dumps({"confirmed": True}),
+                headers=JSON_HEADERS,
+                timeout=30
+            )
+            logger.info("Reply response status: %s", reply_response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Reply headers: %s, body: %s", dict(reply_response.headers), reply_response.text)
+            if reply_response.status_code != 200:
+                self._check_auth(reply_response)
+                return {
+                    'success': False,
+                    'error': f'Confirmation failed: Status {reply_response.status_code}, Response: {reply_response.text}'
+                }
+            reply = _json_loads(reply_response.content)
+            logger.debug("Confirmation response: %s", reply)
+            current_result = reply[0] if isinstance(reply, list) and reply else reply
+            confirmation_count += 1
+        
+        # Extract order_id from final response
+        order_id = None
+        if isinstance(current_result, dict):
+            order_id = current_result.get('order_id') or current_result.get('id')
+        
+        if order_id:
+            return {'success': True, 'order_id': order_id}
+        return {'success': False, 'error': f'Confirmation succeeded but no order_id returned: {current_result}'}
+    
     def place_order(self, conid, order_data):
-        """Place order via Web API"""
-        # First get the account ID
-        accounts_response = self.session.get(f"{self.base_url}/iserver/accounts", timeout=10)
-        if accounts_response.status_code != 200:
-            print(f"   ❌ Failed to get accounts: {accounts_response.status_code}")
-            return accounts_response
+        """Place order via Web API and confirm it
         
-        accounts_data = accounts_response.json()
-        account_id = accounts_data.get('selectedAccount')
+        Returns a dict with 'success' and either 'order_id' or 'error'.
+        """
+        account_id = self._get_account_id()
         if not account_id:
-            print(f"   ❌ No selected account found")
-            return accounts_response
+            return {'success': False, 'error': 'No selected account found'}
         
-        url = f"{self.base_url}/iserver/account/{account_id}/orders"
-        payload = {
-            "orders": [{
-                "acctId": account_id,
-                "conid": int(conid),  # Ensure it's an integer
-                "orderType": order_data["orderType"],
-                "side": order_data["side"],
-                "quantity": order_data["quantity"],
-                "tif": order_data.get("tif", "DAY")  # Default to DAY if not provided
-            }]
-        }
+        # Built from the local ID: the tickle thread may clear the cached one at any moment
+        url = self._orders_url_tpl.format(account_id)
+        payload = {"orders": [self._build_order(account_id, dict(order_data, conid=conid))]}
         
-        # Only add price fields if they exist
-        if order_data.get("price") is not None:
-            payload["orders"][0]["price"] = order_data["price"]
-        if order_data.get("auxPrice") is not None:
-            payload["orders"][0]["auxPrice"] = order_data["auxPrice"]
-        
-        print(f"   📤 Sending order to: {url}")
-        print(f"   📋 Payload: {json.dumps(payload, indent=2)}")
+        logger.info("Sending order to: %s", url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload: %s", json.dumps(payload, indent=2))
         
         try:
-            response = self.session.post(url, json=payload, timeout=30)
-            print(f"   📥 Response status: {response.status_code}")
+            response = self.session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=30)
+            logger.info("Order response status: %s", response.status_code)
             if response.status_code != 200:
-                print(f"   📥 Response headers: {dict(response.headers)}")
-                print(f"   📥 Response text: {response.text}")
-            return response
+                self._check_auth(response)
+                logger.error("Order rejected: %s, headers: %s", response.text, dict(response.headers))
+                return {'success': False, 'error': f'Status: {response.status_code}, Response: {response.text}'}
         except Exception as e:
-            print(f"   ❌ Request exception: {str(e)}")
+            logger.error("Order request exception: %s", e)
             raise
+        
+        results = _json_loads(response.content)
+        logger.debug("Order response: %s", results)
+        if isinstance(results, list):
+            if not results:
+                return {'success': False, 'error': 'No response returned for order'}
+            results = results[0]
+        
+        return self._confirm_order(results)
+    
+    def prefetch_contract(self, symbol):
+        """Look up the conid and tick size for a symbol; (None, None) if the contract isn't found"""
+        conid = self.get_contract_id(symbol)
+        if not conid:
+            return None, None
+        return conid, self.get_price_increment(conid)
     
     def get_contract_id(self, symbol):
         """Get contract ID for a symbol"""
-        url = f"{self.base_url}/iserver/secdef/search"
+        cache_key = symbol.upper()
+        if cache_key in self._conid_cache:
+            return self._conid_cache[cache_key]
+
+        url = self._search_url
         payload = {"symbol": symbol}
-        response = self.session.post(url, json=payload, timeout=30)
+        response = self.session.post(url, data=_json_dumps(payload), headers=JSON_HEADERS, timeout=30)
         if response.status_code == 200:
-            data = response.json()
+            data = _json_loads(response.content)
             if data and len(data) > 0:
-                return data[0].get("conid")
+                conid = data[0].get("conid")
+                if conid:
+                    self._conid_cache[cache_key] = conid
+                return conid
+        self._check_auth(response)
         return None
     
     def get_order_status(self, order_id=None):
@@ -157,7 +350,7 @@ class IBWebAPI:
 
             
             # Get account information to retrieve allocationId or account context
-            accounts_response = self.session.get(f"{self.base_url}/iserver/accounts", timeout=10)
+            accounts_response = self.session.get(self._accounts_url, timeout=10)
             if accounts_response.status_code != 200:
                 print(f"❌ Failed to get accounts for cancellation: {accounts_response.status_code}, {accounts_response.text}")
                 return accounts_response
@@ -201,7 +394,7 @@ class StockTradingServer:
         # In-memory storage
         self.trades: List[Trade] = []
         self.available_risk: float = 0.0
-        self.error_log: List[Dict] = []
+        self.error_log: deque = deque(maxlen=100)  # Keeps only the last 100 errors
         
         self.server_start_time = time.time()
         self.last_trade_time = None
@@ -212,8 +405,8 @@ class StockTradingServer:
         self.is_processing = False
         self.server_running = True
         
-        # IBKR Web API connection
-        self.ib_api = None
+        # IBKR Web API client, created up front so its /tickle keepalive runs before the first trade
+        self.ib_api = IBWebAPI()
         
         # Start processing thread
         self.start_processing_thread()
@@ -352,17 +545,11 @@ class StockTradingServer:
         
         self.error_log.append(error_entry)
         
-        # Keep only last 100 errors
-        if len(self.error_log) > 100:
-            self.error_log = self.error_log[-100:]
-        
         print(f"🚨 Error logged: {error_type} - {error_message}")
     
     def _connect_to_ib(self, ticker: str = "UNKNOWN") -> bool:
         """Connect to IB Web API"""
         try:
-            self.ib_api = IBWebAPI()
-            
             # Test connection
             if not self.ib_api.is_connected():
                 error_msg = "Not authenticated with IBKR Web API. Please authenticate first."
@@ -370,17 +557,14 @@ class StockTradingServer:
                 print(f"❌ {error_msg}")
                 return False
             
-            # Test basic functionality
-            test_response = self.ib_api.session.get(f"{self.ib_api.base_url}/iserver/accounts")
-            if test_response.status_code != 200:
-                error_msg = f"IBKR Web API test failed: {test_response.status_code}"
+            # Test account access (cached after the first successful lookup)
+            account_id = self.ib_api._get_account_id()
+            if not account_id:
+                error_msg = "IBKR Web API test failed: no selected account"
                 self._log_error("CONNECTION_TEST_FAILED", ticker, error_msg)
                 print(f"❌ {error_msg}")
                 return False
-            
-            # Test account access and contract lookup
-            print("✅ Testing account access...")
-            self.ib_api.get_accounts()
+            print(f"✅ Using account {account_id}")
 
             print(f"✅ Testing contract lookup for {ticker}...")
             test_conid = self.ib_api.get_contract_id(ticker)
@@ -399,16 +583,17 @@ class StockTradingServer:
             return False
     
     def _disconnect_from_ib(self):
-        """Disconnect from IBKR Web API"""
-        self.ib_api = None
-        print("✅ Disconnected from IBKR Web API")
+        """Release per-trade IB state; the IBWebAPI client and its session stay up for the next trade"""
+        print("✅ Trade finished, IBKR Web API session kept alive")
         
         self.ib_wrapper = None
         self.ib_client = None
         
-    def _execute_order(self, symbol: str, side: str, quantity: float, order_type: str = "MKT", price: float = None, stop_price: float = None, tif: str = "DAY") -> dict:
+    def _execute_order(self, symbol: str, side: str, quantity: float, order_type: str = "MKT", price: float = None, stop_price: float = None, tif: str = "DAY", conid: int = None) -> dict:
         try:
-            conid = self.ib_api.get_contract_id(symbol)
+            # Callers that already resolved the contract pass conid to skip the lookup
+            if conid is None:
+                conid = self.ib_api.get_contract_id(symbol)
             if not conid:
                 return {'success': False, 'error': f'Could not find contract for {symbol}'}
 
@@ -431,66 +616,25 @@ class StockTradingServer:
 
             order_data["tif"] = tif
 
-            response = self.ib_api.place_order(conid, order_data)
-            print(f"   📤 Order request sent. Status: {response.status_code}")
-            print(f"   📋 Order data: {order_data}")
-            print(f"   📋 Contract ID: {conid}")
-            print(f"   📥 Response headers: {dict(response.headers)}")
-            print(f"   📥 Response body: {response.text}")
-
-            if response.status_code != 200:
-                error_details = f'Status: {response.status_code}, Response: {response.text}'
-                print(f"   ❌ Order failed - {error_details}")
-                return {'success': False, 'error': error_details}
-
-            result = response.json()
-            print(f"   ✅ Order response: {result}")
-
-            # Handle multiple confirmations
-            max_confirmations = 3
-            confirmation_count = 0
-            current_result = result
-
-            while isinstance(current_result, list) and len(current_result) > 0 and 'id' in current_result[0] and confirmation_count < max_confirmations:
-                confirmation_id = current_result[0]['id']
-                print(f"   📩 Confirmation required. Sending reply to ID: {confirmation_id}")
-                reply_response = self.ib_api.session.post(
-                    f"{self.ib_api.base_url}/iserver/reply/{confirmation_id}",
-                    json={"confirmed": True},
-                    timeout=30
-                )
-                print(f"   📥 Reply response status: {reply_response.status_code}, Headers: {dict(reply_response.headers)}, Body: {reply_response.text}")
-                if reply_response.status_code != 200:
-                    return {
-                        'success': False,
-                        'error': f'Confirmation failed: Status {reply_response.status_code}, Response: {reply_response.text}'
-                    }
-                current_result = reply_response.json()
-                print(f"   ✅ Confirmation response: {current_result}")
-                confirmation_count += 1
+            result = self.ib_api.place_order(conid, order_data)
+            logger.debug("Order data: %s, contract ID: %s", order_data, conid)
 
-            # Extract order_id from final response
-            order_id = None
-            if isinstance(current_result, list) and current_result:
-                order_id = current_result[0].get('order_id') or current_result[0].get('id')
-            elif isinstance(current_result, dict):
-                order_id = current_result.get('order_id') or current_result.get('id')
+            if not result['success']:
+                print(f"   ❌ Order failed - {result['error']}")
+                return result
 
-            if order_id:
-                print(f"   📤 BUY ORDER SUBMITTED (Order ID: {order_id})")
-                # Immediate status check
-                time.sleep(1)  # Short delay to allow order registration
-                status_response = self.ib_api.get_order_status(order_id)
-                print(f"   📋 Immediate order status check: {status_response.text}")
-                return {
-                    'success': True,
-                    'order_id': order_id,
-                    'message': 'Order confirmed and placed'
-                }
-            else:
-                error_msg = f'Confirmation succeeded but no order_id returned: {current_result}'
-                print(f"   ❌ BUY ORDER SUBMISSION FAILED: {error_msg}")
-                return {'success': False, 'error': error_msg}
+            order_id = result['order_id']
+            print(f"   📤 BUY ORDER SUBMITTED (Order ID: {order_id})")
+            # Immediate status check
+            time.sleep(1)  # Short delay to allow order registration
+            status_response = self.ib_api.get_order_status(order_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Immediate order status check: %s", status_response.text)
+            return {
+                'success': True,
+                'order_id': order_id,
+                'message': 'Order confirmed and placed'
+            }
 
         except Exception as e:
             error_msg = f"Order execution failed: {str(e)}"
@@ -501,7 +645,7 @@ class StockTradingServer:
         """Wait for an order to fill, handling partial fills and cancellation with proper account context."""
         print(f"   ⏳ Waiting for order {order_id} to fill {expected_shares} shares...")
         
-        start_time = time.time()
+        deadline = time.monotonic_ns() + timeout * 1_000_000_000
         last_filled = 0.0
         no_progress_time = 0
         max_retries = 3
@@ -509,7 +653,7 @@ class StockTradingServer:
         # Initial delay to allow order registration
         time.sleep(2)
         
-        while time.time() - start_time < timeout:
+        while time.monotonic_ns() < deadline:
             for attempt in range(max_retries):
                 try:
                     # Try specific order status first
@@ -703,6 +847,9 @@ class StockTradingServer:
             order_id = result['order_id']
             print(f"   📤 BUY ORDER SUBMITTED (Order ID: {order_id})")
             
+            # Stop orders need the tick size next; look it up while the buy is filling
+            contract_future = prefetch_pool.submit(self.ib_api.prefetch_contract, trade.ticker)
+            
             # Wait for order to fill with partial handling
             fill_result = self._wait_for_order_fill_webapi(order_id, trade.shares, timeout=7)
             
@@ -715,7 +862,8 @@ class StockTradingServer:
                     'success': True,
                     'filled_shares': filled_shares,
                     'avg_price': avg_price,
-                    'full_fill': full_fill
+                    'full_fill': full_fill,
+                    'contract_future': contract_future
                 }
             else:
                 error_msg = f"Buy order {order_id} failed to fill any shares"
@@ -739,8 +887,11 @@ class StockTradingServer:
                 'full_fill': False
             }
     
-    def _execute_sell_stop_orders(self, trade: Trade, actual_shares_bought: float):
-        """Execute sell stop orders based on actual shares bought with proper scaling"""
+    def _execute_sell_stop_orders(self, trade: Trade, actual_shares_bought: float, contract_future: Optional[Future] = None):
+        """Execute sell stop orders based on actual shares bought with proper scaling
+        
+        contract_future is the (conid, tick size) lookup started while the buy was filling, if any.
+        """
         print(f"\n🔴 SETTING SELL STOP ORDERS for {actual_shares_bought} shares:")
         
         if actual_shares_bought == 0:
@@ -750,43 +901,68 @@ class StockTradingServer:
         total_planned_shares = trade.shares
         scale_factor = float(actual_shares_bought) / total_planned_shares
         
-        # Get contract ID for tick size validation
-        conid = self.ib_api.get_contract_id(trade.ticker)
+        # Get contract ID and tick size, preferring the lookup started during the buy
+        conid = price_increment = None
+        if contract_future is not None:
+            try:
+                conid, price_increment = contract_future.result()
+            except Exception as e:
+                error_msg = f"Contract prefetch failed: {str(e)}"
+                print(f"   ⚠️ {error_msg} - looking it up again")
+                self._log_error("CONTRACT_PREFETCH_FAILED", trade.ticker, error_msg)
+        if not conid:
+            conid = self.ib_api.get_contract_id(trade.ticker)
         if not conid:
             print(f"   ❌ Could not find contract for {trade.ticker}")
             self._log_error("CONTRACT_NOT_FOUND", trade.ticker, "Could not find contract ID")
             return
         
-        # Get contract details for tick size
-        contract_details = self.ib_api.get_contract_details(conid)
-        price_increment = 0.01  # Default tick size
-        if contract_details:
-            price_increment = float(contract_details.get('priceIncrement', 0.01))
-            print(f"   📏 Price increment (tick size): ${price_increment}")
+        if price_increment is None:
+            # Tick size is cached per conid, so this only hits the API the first time
+            price_increment = self.ib_api.get_price_increment(conid)
+        print(f"   📏 Price increment (tick size): ${price_increment}")
         
         try:
+            stops_to_place = []
             for i, stop in enumerate(trade.sell_stops, 1):
-                try:
-                    # Scale the shares but keep fractional precision for Web API
-                    scaled_shares = stop.shares * scale_factor
-                    
-                    if scaled_shares < 0.001:  # Minimum fractional share
-                        print(f"   ⚠️ Stop {i}: Skipping (scaled to {scaled_shares:.3f} shares - too small)")
-                        continue
-                    
-                    # Adjust stop price to nearest tick
-                    adjusted_stop_price = round(stop.price / price_increment) * price_increment
-                    if abs(adjusted_stop_price - stop.price) > 0.001:
-                        print(f"   🔧 Adjusted stop price for {trade.ticker} from ${stop.price} to ${adjusted_stop_price}")
-                    
-                    result = self._execute_order(
-                        trade.ticker, 
-                        "SELL", 
+                # Scale the shares but keep fractional precision for Web API
+                scaled_shares = stop.shares * scale_factor
+                
+                if scaled_shares < 0.001:  # Minimum fractional share
+                    print(f"   ⚠️ Stop {i}: Skipping (scaled to {scaled_shares:.3f} shares - too small)")
+                    continue
+                
+                # Adjust stop price to nearest tick; Decimal keeps it an exact multiple (no 148.00000000000003)
+                ticks = (Decimal(str(stop.price)) / price_increment).to_integral_value(rounding=ROUND_HALF_EVEN)
+                adjusted_stop_price = float(ticks * price_increment)
+                if abs(adjusted_stop_price - stop.price) > 0.001:
+                    print(f"   🔧 Adjusted stop price for {trade.ticker} from ${stop.price} to ${adjusted_stop_price}")
+                
+                stops_to_place.append((i, scaled_shares, adjusted_stop_price))
+            
+            if not stops_to_place:
+                print("   ❌ No sell stop orders left to place")
+                return
+            
+            # Stops are independent orders, so submit them concurrently over the shared session
+            with ThreadPoolExecutor(max_workers=len(stops_to_place)) as pool:
+                futures = [
+                    pool.submit(
+                        self._execute_order,
+                        trade.ticker,
+                        "SELL",
                         scaled_shares,
-                        "STP", 
+                        "STP",
                         stop_price=adjusted_stop_price,
-                        tif="GTC"
+                        tif="GTC",
+                        conid=conid
                     )
+                    for _, scaled_shares, adjusted_stop_price in stops_to_place
+                ]
+            
+            for (i, scaled_shares, adjusted_stop_price), future in zip(stops_to_place, futures):
+                try:
+                    result = future.result()
                     
                     if result['success']:
                         print(f"   Stop {i}: {scaled_shares:.3f} shares at ${adjusted_stop_price} - Order ID: {result.get('order_id', 'N/A')}")
@@ -794,8 +970,6 @@ class StockTradingServer:
                         print(f"   ❌ Stop {i} FAILED: {result['error']}")
                         self._log_error("SELL_STOP_ORDER_FAILED", trade.ticker, result['error'])
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     error_msg = f"Sell stop order {i} failed: {str(e)}"
                     print(f"   ❌ SELL STOP ORDER {i} FAILED: {str(e)}")
@@ -812,8 +986,9 @@ class StockTradingServer:
     
     def _find_trade_by_criteria(self, ticker: str, lower_price: float, higher_price: float) -> Optional[Trade]:
         """Find trade by criteria"""
+        query_ticker = ticker.upper()
         for trade in self.trades:
-            if (trade.ticker.upper() == ticker.upper() and 
+            if (trade.ticker.upper() == query_ticker and 
                 abs(trade.lower_price_range - lower_price) < 0.001 and
                 abs(trade.higher_price_range - higher_price) < 0.001):
                 return trade
@@ -821,8 +996,8 @@ class StockTradingServer:
     
     def _validate_trade(self, trade: Trade) -> bool:
         """Validate trade data"""
-        total_stop_shares = sum(stop.shares for stop in trade.sell_stops)
-        if abs(total_stop_shares - trade.shares) > 0.001:
+        total_stop_shares = math.fsum(stop.shares for stop in trade.sell_stops)
+        if not math.isclose(total_stop_shares, trade.shares, abs_tol=0.001):
             print(f"ERROR: Sell stop shares ({total_stop_shares}) don't match total shares ({trade.shares})")
             return False
         
@@ -884,7 +1059,7 @@ class StockTradingServer:
                 return {'success': False, 'error': error_msg}
             
             # Place sell stops
-            self._execute_sell_stop_orders(trade, buy_result['filled_shares'])
+            self._execute_sell_stop_orders(trade, buy_result['filled_shares'], buy_result.get('contract_future'))
             
             result = {
                 'success': True,
@@ -910,12 +1085,10 @@ class StockTradingServer:
         """Internal method to add trade"""
         try:
             
-            sell_stops = []
-            for stop in trade_data.get('sell_stops', []):
-                sell_stops.append(SellStopOrder(
-                    price=float(stop['price']),
-                    shares=float(stop['shares'])
-                ))
+            sell_stops = [
+                SellStopOrder(float(stop['price']), float(stop['shares']))
+                for stop in trade_data.get('sell_stops', [])
+            ]
             
             trade = Trade(
                 ticker=trade_data['ticker'],
@@ -990,7 +1163,7 @@ class StockTradingServer:
     
     def get_errors(self) -> List[Dict]:
         """Get error log (direct access, no queuing needed)"""
-        return self.error_log.copy()
+        return list(self.error_log)
     
     def update_risk_amount(self, new_amount: float) -> dict:
         """Update available risk amount (direct access)"""
@@ -1001,6 +1174,7 @@ class StockTradingServer:
         """Shutdown the server"""
         self.server_running = False
         self.request_queue.put(None)  # Signal shutdown
+        self.ib_api.close()
 
 # Flask app
 app = Flask(__name__)
@@ -2,7 +2,7 @@ import json
 import time
 import threading
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime
 from flask import Flask, request, jsonify
 from ibapi.client import EClient
@@ -11,16 +11,17 @@ from ibapi.contract import Contract
 from ibapi.order import Order
 import math
 from queue import Queue
+from collections import deque
 import uuid
 import flask_cors
 
 
-@dataclass
+@dataclass(slots=True)
 class SellStopOrder:
     price: float
     shares: float
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     ticker: str
     shares: float
@@ -34,37 +35,94 @@ class Trade:
         if self.trade_id is None:
             self.trade_id = str(uuid.uuid4())
 
+@dataclass(slots=True)
+class OrderState:
+    STALL_TIMEOUT = 30  # seconds without fill progress before a partial fill is given up on
+
+    status: str = 'Unknown'
+    filled: float = 0.0
+    remaining: float = 0.0
+    avg_fill_price: float = 0.0
+    error: Optional[str] = None  # Set when TWS reports an order-level error (e.g. a rejection)
+    done: threading.Event = field(default_factory=threading.Event)  # Filled or Cancelled
+    terminal: threading.Event = field(default_factory=threading.Event)  # done, rejected, or stalled on a partial fill
+    stall_timer: Optional[threading.Timer] = None  # Only touched with IBWrapper.orders_lock held
+
+    def restart_stall_timer(self):
+        """(Re)arm the stall timer after fill progress"""
+        self.cancel_stall_timer()
+        self.stall_timer = threading.Timer(self.STALL_TIMEOUT, self.terminal.set)
+        self.stall_timer.daemon = True
+        self.stall_timer.start()
+
+    def cancel_stall_timer(self):
+        if self.stall_timer is not None:
+            self.stall_timer.cancel()
+            self.stall_timer = None
+
 class IBWrapper(EWrapper):
+    # Order-level codes that are only warnings; 2100+ are informational system messages
+    ORDER_WARNING_CODES = (399, 404)
+    
     def __init__(self):
         EWrapper.__init__(self)
         self.next_order_id = None
         self.order_id_event = threading.Event()
-        self.order_fills = {}
-        self.order_events = {}
+        self.orders: Dict[int, OrderState] = {}
+        self.orders_lock = threading.Lock()
         
     def nextValidId(self, orderId: int):
         self.next_order_id = orderId
         self.order_id_event.set()
+    
+    def track_order(self, orderId) -> OrderState:
+        """Start tracking an order before it is placed, so no callback for it is missed"""
+        with self.orders_lock:
+            state = self.orders.get(orderId)
+            if state is None:
+                state = self.orders[orderId] = OrderState()
+            return state
+    
+    def untrack_order(self, orderId):
+        """Stop tracking a finished order"""
+        with self.orders_lock:
+            state = self.orders.pop(orderId, None)
+            if state is not None:
+                state.cancel_stall_timer()
         
     def orderStatus(self, orderId, status, filled, remaining, avgFillPrice, permId, parentId, lastFillPrice, clientId, whyHeld, mktCapPrice):
         print(f"Order {orderId}: Status={status}, Filled={filled}, Remaining={remaining}, AvgPrice={avgFillPrice}")
         
-        self.order_fills[orderId] = {
-            'status': status,
-            'filled': float(filled),
-            'remaining': float(remaining),
-            'avgFillPrice': float(avgFillPrice)
-        }
-        
-        if status in ['Filled', 'Cancelled']:
-            if orderId in self.order_events:
-                self.order_events[orderId].set()
+        with self.orders_lock:
+            state = self.orders.get(orderId)
+            if state is None:
+                return  # Not waited on (e.g. a sell stop) or already finished
+            previously_filled = state.filled
+            state.status = status
+            state.filled = float(filled)
+            state.remaining = float(remaining)
+            state.avg_fill_price = float(avgFillPrice)
+            
+            # The callback decides the outcome; the waiter only sleeps on the events
+            if status in ('Filled', 'Cancelled'):
+                state.cancel_stall_timer()
+                state.done.set()
+                state.terminal.set()
+            elif state.filled > previously_filled:
+                state.restart_stall_timer()
         
     def error(self, reqId, errorCode, errorString, advancedOrderRejectJson=""):
         print(f"Error {reqId}: {errorCode} - {errorString}")
         
-        if reqId in self.order_events:
-            self.order_events[reqId].set()
+        if reqId < 0 or errorCode >= 2100 or errorCode in self.ORDER_WARNING_CODES:
+            return
+        with self.orders_lock:
+            state = self.orders.get(reqId)
+            if state is not None and not state.done.is_set():
+                # A rejected order gets no final orderStatus, so end the wait here
+                state.error = f"{errorCode} - {errorString}"
+                state.cancel_stall_timer()
+                state.terminal.set()
 
 class IBClient(EClient):
     def __init__(self, wrapper):
@@ -75,8 +133,10 @@ class StockTradingServer:
     def __init__(self):
         # In-memory storage
         self.trades: List[Trade] = []
+        # (TICKER, lower, higher) rounded to 3 decimals -> trades, for O(1) lookups by criteria
+        self._trade_index: Dict[tuple, List[Trade]] = {}
         self.available_risk: float = 0.0
-        self.error_log: List[Dict] = []
+        self.error_log: deque = deque(maxlen=100)  # Keeps only the last 100 errors
         
         self.server_start_time = time.time()  # Track when server started
         self.last_trade_time = None  # Track last trade execution
@@ -90,6 +150,7 @@ class StockTradingServer:
         # IBKR connection
         self.ib_wrapper = None
         self.ib_client = None
+        self._contract_cache: Dict[str, Contract] = {}
         
         
         
@@ -121,7 +182,7 @@ class StockTradingServer:
                 return {'success': False, 'error': 'Trade not found'}
             
             # Remove the trade
-            self.trades.remove(trade_to_remove)
+            self._remove_trade_from_list(trade_to_remove)
             
             return {
                 'success': True,
@@ -230,10 +291,6 @@ class StockTradingServer:
         
         self.error_log.append(error_entry)
         
-        # Keep only last 100 errors
-        if len(self.error_log) > 100:
-            self.error_log = self.error_log[-100:]
-        
         print(f"🚨 Error logged: {error_type} - {error_message}")
     
     def _connect_to_ib(self, ticker: str = "UNKNOWN") -> bool:
@@ -275,63 +332,61 @@ class StockTradingServer:
     
     def _wait_for_order_fill(self, order_id: int, expected_shares: float, timeout: int = 60) -> dict:
         """Wait for order to be filled with cancellation support"""
-        self.ib_wrapper.order_events[order_id] = threading.Event()
-        
+        state = self.ib_wrapper.track_order(order_id)
+        try:
+            return self._wait_for_order_outcome(order_id, state, expected_shares, timeout)
+        finally:
+            self.ib_wrapper.untrack_order(order_id)
+    
+    def _wait_for_order_outcome(self, order_id: int, state: OrderState, expected_shares: float, timeout: int) -> dict:
+        """Wait on the order's events and cancel it if it doesn't finish in time"""
         print(f"   ⏳ Waiting for order {order_id} to fill {expected_shares} shares...")
         
-        start_time = time.time()
-        last_filled = 0
-        no_progress_time = 0
-        
-        while time.time() - start_time < timeout:
-            if self.ib_wrapper.order_events[order_id].wait(timeout=5):
-                order_status = self.ib_wrapper.order_fills.get(order_id, {})
-                status = order_status.get('status', 'Unknown')
-                filled_qty = float(order_status.get('filled', 0))
-                remaining_qty = float(order_status.get('remaining', expected_shares))
-                avg_price = float(order_status.get('avgFillPrice', 0))
-                
-                if filled_qty > last_filled:
-                    last_filled = filled_qty
-                    no_progress_time = 0
-                    print(f"   📈 Progress: {filled_qty}/{expected_shares} shares filled at avg ${avg_price}")
-                
-                if status == 'Filled':
-                    print(f"   ✅ Order {order_id} FULLY FILLED: {filled_qty} shares at ${avg_price}")
-                    return {
-                        'success': True,
-                        'filled_shares': filled_qty,
-                        'remaining_shares': 0,
-                        'avg_price': avg_price,
-                        'status': status,
-                        'cancelled': False
-                    }
-                
-                elif status == 'Cancelled':
-                    print(f"   ❌ Order {order_id} CANCELLED: {filled_qty} shares filled, {remaining_qty} remaining")
-                    return {
-                        'success': filled_qty > 0,
-                        'filled_shares': filled_qty,
-                        'remaining_shares': remaining_qty,
-                        'avg_price': avg_price,
-                        'status': status,
-                        'cancelled': True
-                    }
-                
-                elif filled_qty > 0 and filled_qty < expected_shares:
-                    if status in ['PartiallyFilled', 'Submitted']:
-                        no_progress_time += 5
-                        
-                        if no_progress_time >= 30:
-                            print(f"   ⚠️ No progress for 30s on partial fill. Considering cancellation...")
-                            break
-                        
-                        print(f"   ⏳ Partial fill: {filled_qty}/{expected_shares} shares. Waiting for more...")
-                        continue
-                
-                self.ib_wrapper.order_events[order_id].clear()
-            else:
-                no_progress_time += 5
+        # Set by orderStatus on Filled/Cancelled, by error on a rejection, or by the stall timer on a stuck partial fill
+        state.terminal.wait(timeout)
+        with self.ib_wrapper.orders_lock:
+            state.cancel_stall_timer()
+            status = state.status
+            filled_qty = state.filled
+            remaining_qty = state.remaining
+            avg_price = state.avg_fill_price
+            error = state.error
+        
+        if status == 'Filled':
+            print(f"   ✅ Order {order_id} FULLY FILLED: {filled_qty} shares at ${avg_price}")
+            return {
+                'success': True,
+                'filled_shares': filled_qty,
+                'remaining_shares': 0,
+                'avg_price': avg_price,
+                'status': status,
+                'cancelled': False
+            }
+        
+        elif status == 'Cancelled':
+            print(f"   ❌ Order {order_id} CANCELLED: {filled_qty} shares filled, {remaining_qty} remaining")
+            return {
+                'success': filled_qty > 0,
+                'filled_shares': filled_qty,
+                'remaining_shares': remaining_qty,
+                'avg_price': avg_price,
+                'status': status,
+                'cancelled': True
+            }
+        
+        if error is not None:
+            print(f"   ❌ Order {order_id} REJECTED: {error}")
+            return {
+                'success': filled_qty > 0,
+                'filled_shares': filled_qty,
+                'remaining_shares': remaining_qty if status != 'Unknown' else expected_shares - filled_qty,
+                'avg_price': avg_price,
+                'status': 'Rejected',
+                'cancelled': False
+            }
+        
+        if state.terminal.is_set():
+            print(f"   ⚠️ No progress for {OrderState.STALL_TIMEOUT}s on partial fill ({filled_qty}/{expected_shares}). Considering cancellation...")
         
         # Cancel order on timeout
         print(f"   ⏰ Order {order_id} timeout. Attempting to cancel...")
@@ -340,11 +395,10 @@ class StockTradingServer:
             self.ib_client.reqGlobalCancel()
             print(f"   📤 Cancellation request sent for order {order_id}")
             
-            if self.ib_wrapper.order_events[order_id].wait(timeout=10):
-                order_status = self.ib_wrapper.order_fills.get(order_id, {})
-                filled_qty = float(order_status.get('filled', 0))
-                remaining_qty = float(order_status.get('remaining', expected_shares - filled_qty))
-                avg_price = float(order_status.get('avgFillPrice', 0))
+            if state.done.wait(timeout=10):
+                filled_qty = state.filled
+                remaining_qty = state.remaining
+                avg_price = state.avg_fill_price
                 
                 return {
                     'success': filled_qty > 0,
@@ -358,10 +412,9 @@ class StockTradingServer:
             print(f"   ❌ Failed to cancel order {order_id}: {str(e)}")
         
         # Fallback
-        order_status = self.ib_wrapper.order_fills.get(order_id, {})
-        filled_qty = float(order_status.get('filled', 0))
-        remaining_qty = float(order_status.get('remaining', expected_shares - filled_qty))
-        avg_price = float(order_status.get('avgFillPrice', 0))
+        filled_qty = state.filled
+        remaining_qty = state.remaining if state.status != 'Unknown' else expected_shares - filled_qty
+        avg_price = state.avg_fill_price
         
         return {
             'success': filled_qty > 0,
@@ -373,12 +426,15 @@ class StockTradingServer:
         }
     
     def _create_stock_contract(self, ticker: str) -> Contract:
-        """Create stock contract"""
-        contract = Contract()
-        contract.symbol = ticker
-        contract.secType = "STK"
-        contract.exchange = "SMART"
-        contract.currency = "USD"
+        """Create stock contract, reusing one Contract per ticker"""
+        contract = self._contract_cache.get(ticker)
+        if contract is None:
+            contract = Contract()
+            contract.symbol = ticker
+            contract.secType = "STK"
+            contract.exchange = "SMART"
+            contract.currency = "USD"
+            self._contract_cache[ticker] = contract
         return contract
     
     def _create_market_order(self, action: str, shares: float) -> Order:
@@ -416,6 +472,7 @@ class StockTradingServer:
             order = self._create_market_order("BUY", trade.shares)
             order_id = self._get_next_order_id()
             
+            self.ib_wrapper.track_order(order_id)
             self.ib_client.placeOrder(order_id, contract, order)
             print(f"   📤 BUY ORDER SUBMITTED (Order ID: {order_id})")
             
@@ -486,8 +543,6 @@ class StockTradingServer:
                     self.ib_client.placeOrder(order_id, contract, order)
                     print(f"   Stop {i}: {scaled_shares} shares at ${stop.price} - Order ID: {order_id}")
                     
-                    time.sleep(0.5)
-                    
                 except Exception as e:
                     error_msg = f"Sell stop order {i} failed: {str(e)}"
                     print(f"   ❌ SELL STOP ORDER {i} FAILED: {str(e)}")
@@ -502,10 +557,31 @@ class StockTradingServer:
             self._log_error("SELL_STOP_ORDERS_FAILED", trade.ticker, error_msg)
             raise
     
+    @staticmethod
+    def _trade_key(ticker: str, lower_price: float, higher_price: float) -> tuple:
+        """Index key for a trade's ticker and price range"""
+        return (ticker.upper(), round(lower_price, 3), round(higher_price, 3))
+    
+    def _remove_trade_from_list(self, trade: Trade):
+        """Remove a trade from the list and the criteria index"""
+        self.trades.remove(trade)
+        key = self._trade_key(trade.ticker, trade.lower_price_range, trade.higher_price_range)
+        bucket = self._trade_index.get(key)
+        if bucket:
+            bucket.remove(trade)
+            if not bucket:
+                del self._trade_index[key]
+    
     def _find_trade_by_criteria(self, ticker: str, lower_price: float, higher_price: float) -> Optional[Trade]:
         """Find trade by criteria"""
+        bucket = self._trade_index.get(self._trade_key(ticker, lower_price, higher_price))
+        if bucket:
+            return bucket[0]
+        
+        # Prices within tolerance can round to a neighbouring key, so fall back to a scan on a miss
+        query_ticker = ticker.upper()
         for trade in self.trades:
-            if (trade.ticker.upper() == ticker.upper() and 
+            if (trade.ticker.upper() == query_ticker and 
                 abs(trade.lower_price_range - lower_price) < 0.001 and
                 abs(trade.higher_price_range - higher_price) < 0.001):
                 return trade
@@ -513,8 +589,8 @@ class StockTradingServer:
     
     def _validate_trade(self, trade: Trade) -> bool:
         """Validate trade data"""
-        total_stop_shares = sum(stop.shares for stop in trade.sell_stops)
-        if abs(total_stop_shares - trade.shares) > 0.001:
+        total_stop_shares = math.fsum(stop.shares for stop in trade.sell_stops)
+        if not math.isclose(total_stop_shares, trade.shares, abs_tol=0.001):
             print(f"ERROR: Sell stop shares ({total_stop_shares}) don't match total shares ({trade.shares})")
             return False
         
@@ -548,7 +624,7 @@ class StockTradingServer:
             error_msg = "Trade validation failed"
             print(f"❌ {error_msg}. Removing invalid trade.")
             self._log_error("TRADE_VALIDATION_FAILED", ticker, error_msg)
-            self.trades.remove(trade)
+            self._remove_trade_from_list(trade)
             return {'success': False, 'error': error_msg}
         
         # Connect to IB
@@ -562,7 +638,7 @@ class StockTradingServer:
             self.last_trade_time = time.time()
             
             # Remove trade from list and update risk
-            self.trades.remove(trade)
+            self._remove_trade_from_list(trade)
             self.available_risk -= trade.risk_amount
             print(f"✅ Trade removed from queue. Available risk: ${self.available_risk}")
             
@@ -602,12 +678,10 @@ class StockTradingServer:
         """Internal method to add trade"""
         try:
             
-            sell_stops = []
-            for stop in trade_data.get('sell_stops', []):
-                sell_stops.append(SellStopOrder(
-                    price=float(stop['price']),
-                    shares=float(stop['shares'])
-                ))
+            sell_stops = [
+                SellStopOrder(float(stop['price']), float(stop['shares']))
+                for stop in trade_data.get('sell_stops', [])
+            ]
             
             trade = Trade(
                 ticker=trade_data['ticker'],
@@ -622,6 +696,7 @@ class StockTradingServer:
                 return {'success': False, 'error': 'Trade validation failed'}
             
             self.trades.append(trade)
+            self._trade_index.setdefault(self._trade_key(trade.ticker, trade.lower_price_range, trade.higher_price_range), []).append(trade)
             
             return {
                 'success': True,
@@ -682,7 +757,7 @@ class StockTradingServer:
     
     def get_errors(self) -> List[Dict]:
         """Get error log (direct access, no queuing needed)"""
-        return self.error_log.copy()
+        return list(self.error_log)
     
     def update_risk_amount(self, new_amount: float) -> dict:
         """Update available risk amount (direct access)"""
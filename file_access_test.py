@@ -1,27 +1,36 @@
 import sys
-import msvcrt
 import os
-from time import sleep
+
+try:
+    import msvcrt
+except ImportError:  # POSIX: fall back to flock
+    msvcrt = None
+    import fcntl
 
 # File to manage
 DATA_FILE = "dollars_to_risk.txt"
 
 def lock_file(file):
-    """Lock the file using Windows file locking."""
+    """Lock the file (msvcrt byte lock on Windows, flock elsewhere)."""
     file.seek(0)
-    for _ in range(10):  # Retry up to 10 times
-        try:
-            msvcrt.locking(file.fileno(), msvcrt.LK_NBLCK, 1)
-            return True
-        except OSError:
-            sleep(0.1)  # Wait briefly before retrying
-    return False
+    try:
+        if msvcrt:
+            # LK_LOCK blocks until the lock is granted (the CRT retries for ~10 seconds)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        return True
+    except OSError:
+        return False
 
 def unlock_file(file):
     """Unlock the file."""
     file.seek(0)
     try:
-        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        if msvcrt:
+            msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
     except OSError:
         pass
 
@@ -51,6 +60,18 @@ def append_row(data):
     except Exception as e:
         return f"Error: {str(e)}"
 
+def append_rows(rows):
+    """Append several rows to the file under a single lock."""
+    try:
+        with open(DATA_FILE, 'a') as file:
+            if not lock_file(file):
+                return "Error: Could not acquire file lock"
+            file.write(''.join(row + '\n' for row in rows))
+            unlock_file(file)
+            return f"Success: {len(rows)} rows appended"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
 def modify_row(row_index, new_data):
     """Modify a specific row in the file."""
     try:
@@ -93,41 +114,60 @@ def delete_row(row_index):
     except Exception as e:
         return f"Error: {str(e)}"
 
+def _cmd_read(args):
+    print(read_file())
+
+def _cmd_append(args):
+    if len(args) != 1:
+        print("Usage: python file_gateway.py append <data>")
+        sys.exit(1)
+    print(append_row(args[0]))
+
+def _cmd_append_batch(args):
+    if len(args) < 1:
+        print("Usage: python file_gateway.py append_batch <data> [<data> ...]")
+        sys.exit(1)
+    print(append_rows(args))
+
+def _cmd_modify(args):
+    if len(args) != 2:
+        print("Usage: python file_gateway.py modify <row_index> <data>")
+        sys.exit(1)
+    try:
+        row_index = int(args[0])
+        print(modify_row(row_index, args[1]))
+    except ValueError:
+        print("Error: row_index must be an integer")
+
+def _cmd_delete(args):
+    if len(args) != 1:
+        print("Usage: python file_gateway.py delete <row_index>")
+        sys.exit(1)
+    try:
+        row_index = int(args[0])
+        print(delete_row(row_index))
+    except ValueError:
+        print("Error: row_index must be an integer")
+
+def _cmd_unknown(args):
+    print("Invalid operation. Use: read, append, append_batch, modify, delete")
+
+HANDLERS = {
+    "read": _cmd_read,
+    "append": _cmd_append,
+    "append_batch": _cmd_append_batch,
+    "modify": _cmd_modify,
+    "delete": _cmd_delete,
+}
+
 def main():
     if len(sys.argv) < 2:
         print("Usage: python file_gateway.py <operation> [args]")
-        print("Operations: read, append <data>, modify <row_index> <data>, delete <row_index>")
+        print("Operations: read, append <data>, append_batch <data> [<data> ...], modify <row_index> <data>, delete <row_index>")
         sys.exit(1)
 
     operation = sys.argv[1].lower()
-
-    if operation == "read":
-        print(read_file())
-    elif operation == "append":
-        if len(sys.argv) != 3:
-            print("Usage: python file_gateway.py append <data>")
-            sys.exit(1)
-        print(append_row(sys.argv[2]))
-    elif operation == "modify":
-        if len(sys.argv) != 4:
-            print("Usage: python file_gateway.py modify <row_index> <data>")
-            sys.exit(1)
-        try:
-            row_index = int(sys.argv[2])
-            print(modify_row(row_index, sys.argv[3]))
-        except ValueError:
-            print("Error: row_index must be an integer")
-    elif operation == "delete":
-        if len(sys.argv) != 3:
-            print("Usage: python file_gateway.py delete <row_index>")
-            sys.exit(1)
-        try:
-            row_index = int(sys.argv[2])
-            print(delete_row(row_index))
-        except ValueError:
-            print("Error: row_index must be an integer")
-    else:
-        print("Invalid operation. Use: read, append, modify, delete")
+    HANDLERS.get(operation, _cmd_unknown)(sys.argv[2:])
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,17 +2,27 @@
 import pytz
 from datetime import datetime, timedelta, time as dt_time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import argparse
 import logging
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 import json
 from typing import List, Dict, Optional, Tuple
-import statistics
+import math
+import bisect
 import random
 import os
 import glob
+import re
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -46,94 +56,210 @@ logger.addHandler(file_handler)
 
 logger.info(f"Logging to file: {log_filename}")
 
+def _json_loads(data):
+    """Parse a JSON response body, using orjson when available"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+# Market hours are defined in US Eastern time; resolve the zone once
+ET = pytz.timezone('US/Eastern')
+
+# Trailing UTC designator or offset on record timestamps; records are compared as naive datetimes
+_TZ_SUFFIX_RE = re.compile(r'(Z|[+-]\d\d:?\d\d)$')
+
+class HistorySnapshot:
+    """A ticker's parsed history, kept up to date as deltas arrive and shared by every condition check"""
+    def __init__(self):
+        self.times: List[datetime] = []          # every parseable record, chronological
+        self.records: List[Dict] = []
+        self.unique_times: List[datetime] = []   # first held record of each (price, volume) pair
+        self.unique_records: List[Dict] = []
+        self.dropped = 0                         # records evicted so far; positions below are offset by it
+        self.occurrences: Dict[tuple, deque] = {}  # (price, volume) -> positions of the held records with it
+    
+    @staticmethod
+    def _key(record: Dict) -> Optional[tuple]:
+        # Create a key from price and volume to identify duplicates
+        if record.get('currentPrice') is None:
+            return None
+        return (record.get('currentPrice'), record.get('volume'))
+    
+    def add(self, record_time: datetime, record: Dict):
+        """Append a record that is newer than everything already held"""
+        self.times.append(record_time)
+        self.records.append(record)
+        key = self._key(record)
+        if key is None:
+            return
+        positions = self.occurrences.get(key)
+        if positions is None:
+            positions = self.occurrences[key] = deque()
+            self.unique_times.append(record_time)
+            self.unique_records.append(record)
+        positions.append(self.dropped + len(self.records) - 1)
+    
+    def drop_oldest(self, count: int):
+        """Forget the oldest records, touching only the evicted ones and their keys"""
+        evicted = self.records[:count]
+        del self.times[:count]
+        del self.records[:count]
+        
+        # Evicted records are the oldest, so the unique entries they backed are a prefix of the unique view
+        unique_gone = 0
+        replace = []
+        for record in evicted:
+            key = self._key(record)
+            if key is None:
+                continue
+            self.occurrences[key].popleft()
+            if unique_gone < len(self.unique_records) and self.unique_records[unique_gone] is record:
+                unique_gone += 1
+                replace.append(key)
+        del self.unique_times[:unique_gone]
+        del self.unique_records[:unique_gone]
+        self.dropped += count
+        
+        # A pair seen again after its first record was evicted is now first seen at its next held record
+        for key in replace:
+            positions = self.occurrences[key]
+            if not positions:
+                del self.occurrences[key]
+                continue
+            pos = positions[0] - self.dropped
+            i = bisect.bisect_right(self.unique_times, self.times[pos])
+            self.unique_times.insert(i, self.times[pos])
+            self.unique_records.insert(i, self.records[pos])
+
 class StockTradingBot:
+    DATA_REQUEST_TIMEOUT = 5  # seconds; the data server is polled every couple of seconds
+    OUT_OF_RANGE_SLEEP = 5  # seconds between polls while the price is outside the pivot
+    MAX_OUT_OF_RANGE_SLEEP = 30  # backoff ceiling while the price stays far outside the pivot
+    PREFETCH_LEAD = 0.3  # seconds before the next poll that its history request is sent
+    
     def __init__(self, data_server_url: str = "http://localhost:5001", 
                  trade_server_url: str = "http://localhost:5002"):
         self.data_server_url = data_server_url
         self.trade_server_url = trade_server_url
         self.running = False
         self.pivot_entry_time = None  # Track when price first entered pivot range
-        
-    def get_ticker_data(self, symbol: str) -> Optional[List[Dict]]:
-        """Get historical data for a ticker from the data server"""
+        self._out_of_range_sleep = self.OUT_OF_RANGE_SLEEP
+        
+        # One keep-alive session for all polling; retries only apply to idempotent GETs
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # Per-ticker history; after the first poll only newer records are fetched
+        self._history: Dict[str, List[Dict]] = {}
+        # Parsed and de-duplicated view of each history, updated with the same deltas
+        self._snapshots: Dict[str, HistorySnapshot] = {}
+        
+        # Runs the next poll's history request while the loop is still sleeping
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        
+    def _parse_timestamp(self, timestamp_str: str) -> datetime:
+        """Parse a record timestamp, dropping its offset"""
+        # Drop the offset in one pass, then parse
+        naive_str = _TZ_SUFFIX_RE.sub('', timestamp_str)
         try:
-            response = requests.get(f"{self.data_server_url}/data/{symbol}")
-            if response.status_code == 200:
-                data = response.json()
-                return data.get('data', [])
-            else:
-                logger.error(f"Failed to get data for {symbol}: {response.status_code}")
-                return None
-        except Exception as e:
-            logger.error(f"Error fetching data for {symbol}: {str(e)}")
-            return None
+            record_time = datetime.fromisoformat(naive_str)
+        except ValueError:
+            # Try alternative parsing if fromisoformat fails
+            record_time = datetime.strptime(naive_str, '%Y-%m-%dT%H:%M:%S.%f')
+        return record_time
     
-    def get_latest_data(self, symbol: str) -> Optional[Dict]:
-        """Get the latest data point for a ticker"""
+    def get_ticker_data(self, symbol: str, prefetched: Optional[Future] = None) -> Optional[List[Dict]]:
+        """Get historical data for a ticker from the data server, using a prefetched response if given"""
         try:
-            response = requests.get(f"{self.data_server_url}/data/{symbol}/latest")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Failed to get latest data for {symbol}: {response.status_code}")
+            fetched = None
+            if prefetched is not None:
+                try:
+                    fetched = prefetched.result(timeout=self.DATA_REQUEST_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Prefetch for {symbol} failed, fetching again: {str(e)}")
+            if fetched is None:
+                fetched = self._fetch_history(symbol)
+            if fetched is None:
                 return None
+            
+            new_records, total_count = fetched
+            return self._merge_history(symbol, new_records, total_count)
         except Exception as e:
-            logger.error(f"Error fetching latest data for {symbol}: {str(e)}")
+            logger.error(f"Error fetching data for {symbol}: {str(e)}")
             return None
     
-    def filter_unique_prices(self, data: List[Dict]) -> List[Dict]:
-        """Filter out duplicate price/volume combinations, keeping only unique entries"""
-        seen = set()
-        unique_data = []
+    def _fetch_history(self, symbol: str) -> Optional[Tuple[List[Dict], Optional[int]]]:
+        """Request the records newer than the cached history (all of them on the first call)"""
+        cached = self._history.get(symbol)
+        params = {'since': cached[-1]['timestamp']} if cached else None
+        response = self.session.get(f"{self.data_server_url}/data/{symbol}", params=params,
+                                    timeout=self.DATA_REQUEST_TIMEOUT)
+        if response.status_code != 200:
+            logger.error(f"Failed to get data for {symbol}: {response.status_code}")
+            return None
+        
+        data = _json_loads(response.content)
+        return data.get('data', []), data.get('total_count')
+    
+    def _merge_history(self, symbol: str, new_records: List[Dict], total_count: Optional[int]) -> List[Dict]:
+        """Fold a fetched delta into the cached history and its snapshot; runs on the monitoring thread"""
+        cached = self._history.get(symbol)
+        snapshot = self._snapshots.get(symbol)
+        if cached and snapshot is not None and total_count is not None:
+            # Append the delta in place and drop whatever the server has evicted or cleared from the front
+            history = cached
+            history.extend(new_records)
+            self._extend_snapshot(snapshot, new_records)
+            evicted_count = len(history) - total_count
+            if evicted_count > 0:
+                # Records whose timestamp failed to parse never made it into the snapshot
+                dropped = 0
+                for record in islice(history, evicted_count):
+                    if dropped < len(snapshot.records) and snapshot.records[dropped] is record:
+                        dropped += 1
+                del history[:evicted_count]
+                snapshot.drop_oldest(dropped)
+        else:
+            history = new_records
+            self._snapshots[symbol] = self.build_snapshot(history)
         
-        for record in data:
-            # Create a key from price and volume to identify duplicates
-            key = (record.get('currentPrice'), record.get('volume'))
-            if key not in seen and record.get('currentPrice') is not None:
-                seen.add(key)
-                unique_data.append(record)
+        self._history[symbol] = history
+        return history
+    
+    def build_snapshot(self, data: List[Dict]) -> HistorySnapshot:
+        """Parse, sort and de-duplicate a full history"""
+        snapshot = HistorySnapshot()
+        self._extend_snapshot(snapshot, data)
+        return snapshot
+    
+    def _extend_snapshot(self, snapshot: HistorySnapshot, records: List[Dict]):
+        """Parse and add records that are all newer than the ones already in the snapshot"""
+        timestamped_data = []
+        for record in records:
+            try:
+                timestamped_data.append((self._parse_timestamp(record['timestamp']), record))
+            except (ValueError, KeyError) as e:
+                logger.debug(f"Failed to parse timestamp {record.get('timestamp', 'N/A')}: {e}")
+        timestamped_data.sort(key=lambda x: x[0])
         
-        return unique_data
+        for record_time, record in timestamped_data:
+            snapshot.add(record_time, record)
     
-    def get_data_in_time_range(self, data: List[Dict], start_seconds: int, end_seconds: int) -> List[Dict]:
-        """Get data within a specific time range (seconds ago)"""
-        now = datetime.now()
+    def get_data_in_time_range(self, times: List[datetime], records: List[Dict], start_seconds: int, end_seconds: int,
+                               now: Optional[datetime] = None) -> List[Dict]:
+        """Get data within a specific time range (seconds ago); times must be sorted"""
+        if now is None:
+            now = datetime.now()
         start_time = now - timedelta(seconds=start_seconds)  # Further back in time
         end_time = now - timedelta(seconds=end_seconds)      # More recent time
         
         logger.info(f"Time range: {start_time.strftime('%H:%M:%S.%f')} to {end_time.strftime('%H:%M:%S.%f')} (current: {now.strftime('%H:%M:%S.%f')})")
         
-        filtered_data = []
-        for record in data:
-            try:
-                timestamp_str = record['timestamp']
-                
-                # Handle different timestamp formats
-                if timestamp_str.endswith('Z'):
-                    timestamp_str = timestamp_str[:-1]
-                elif '+' in timestamp_str:
-                    timestamp_str = timestamp_str.split('+')[0]
-                elif timestamp_str.endswith('+00:00'):
-                    timestamp_str = timestamp_str[:-6]
-                
-                # Parse the timestamp
-                try:
-                    record_time = datetime.fromisoformat(timestamp_str)
-                except ValueError:
-                    # Try alternative parsing if fromisoformat fails
-                    record_time = datetime.strptime(timestamp_str, '%Y-%m-%dT%H:%M:%S.%f')
-                
-                # Check if the record time is within our range
-                # record_time should be between start_time (older) and end_time (newer)
-                if record_time >= start_time and record_time <= end_time:
-                    filtered_data.append(record)
-                    logger.debug(f"Record {record_time.strftime('%H:%M:%S.%f')} is within range")
-                else:
-                    logger.debug(f"Record {record_time.strftime('%H:%M:%S.%f')} is outside range")
-                    
-            except (ValueError, KeyError) as e:
-                logger.debug(f"Failed to parse timestamp {record.get('timestamp', 'N/A')}: {e}")
-                continue
+        # record_time should be between start_time (older) and end_time (newer), both inclusive
+        lo = bisect.bisect_left(times, start_time)
+        hi = bisect.bisect_right(times, end_time)
+        filtered_data = records[lo:hi]
         
         logger.info(f"Time range filter: {start_seconds}s to {end_seconds}s ago, found {len(filtered_data)} records")
         return filtered_data
@@ -147,12 +273,11 @@ class StockTradingBot:
         if not prices:
             return None
         
-        return statistics.mean(prices)
+        return math.fsum(prices) / len(prices)
 
     def get_minutes_since_market_open(self) -> Optional[int]:
         """Get the number of minutes since market opened today"""
-        et = pytz.timezone('US/Eastern')
-        now = datetime.now(et)
+        now = datetime.now(ET)
         
         # Check if market is currently open
         if not is_market_open():
@@ -165,12 +290,13 @@ class StockTradingBot:
         minutes_since_open = (now - market_open_today).total_seconds() / 60
         return int(minutes_since_open)
     
-    def calculate_volume_increase_in_timeframe(self, data: List[Dict], minutes: int) -> Optional[int]:
+    def calculate_volume_increase_in_timeframe(self, snapshot: HistorySnapshot, minutes: int,
+                                               now: Optional[datetime] = None) -> Optional[int]:
         """Calculate volume increase in the last X minutes"""
         logger.info(f"   Calculating volume increase for timeframe: {minutes} minutes")
         
         if minutes == -1:  # Entire day - calculate total volume for the day
-            total_volume = sum(record.get('volume', 0) for record in data if record.get('volume') is not None)
+            total_volume = sum(record.get('volume', 0) for record in snapshot.records if record.get('volume') is not None)
             logger.info(f"   Total daily volume calculated: {total_volume}")
             return total_volume if total_volume > 0 else None
         
@@ -181,59 +307,24 @@ class StockTradingBot:
                     f"adjusting timeframe from {minutes} to {minutes_since_open} minutes")
             minutes = minutes_since_open  # Use actual time since market open
 
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         cutoff_time = now - timedelta(minutes=minutes)
         
-        # Sort data by timestamp to get chronological order
-        timestamped_data = []
-        for record in data:
-            try:
-                timestamp_str = record['timestamp']
-                
-                # Handle different timestamp formats
-                if timestamp_str.endswith('Z'):
-                    timestamp_str = timestamp_str[:-1]
-                elif '+' in timestamp_str:
-                    timestamp_str = timestamp_str.split('+')[0]
-                elif timestamp_str.endswith('+00:00'):
-                    timestamp_str = timestamp_str[:-6]
-                
-                # Parse the timestamp
-                try:
-                    record_time = datetime.fromisoformat(timestamp_str)
-                except ValueError:
-                    # Try alternative parsing if fromisoformat fails
-                    record_time = datetime.strptime(timestamp_str, '%Y-%m-%dT%H:%M:%S.%f')
-                
-                timestamped_data.append((record_time, record))
-                        
-            except (ValueError, KeyError) as e:
-                logger.debug(f"Failed to parse timestamp {record.get('timestamp', 'N/A')}: {e}")
-                continue
-        
-        # Sort by timestamp
-        timestamped_data.sort(key=lambda x: x[0])
-
-        logger.info(f"   First record and last in timeframe in format {timestamped_data[0][0].strftime('%H:%M:%S')} | Price: {timestamped_data[0][1].get('currentPrice')} | Volume: {timestamped_data[0][1].get('volume')}")
-        logger.info(f"   Last record in timeframe in format {timestamped_data[-1][0].strftime('%H:%M:%S')} | Price: {timestamped_data[-1][1].get('currentPrice')} | Volume: {timestamped_data[-1][1].get('volume')}")
+        # The snapshot is already parsed and in chronological order
+        times, records = snapshot.times, snapshot.records
+        if not records:
+            logger.info("No volume data available at all")
+            return None
 
-        # Find the volume at the cutoff time (start of the timeframe)
-        volume_at_cutoff = None
-        current_volume = None
-        first_available_volume = None
+        logger.info(f"   First record and last in timeframe in format {times[0].strftime('%H:%M:%S')} | Price: {records[0].get('currentPrice')} | Volume: {records[0].get('volume')}")
+        logger.info(f"   Last record in timeframe in format {times[-1].strftime('%H:%M:%S')} | Price: {records[-1].get('currentPrice')} | Volume: {records[-1].get('volume')}")
 
-        for record_time, record in timestamped_data:
-            volume = record.get('volume')
-            if volume is not None:
-                # Keep track of the first available volume
-                if first_available_volume is None:
-                    first_available_volume = volume
-                
-                if record_time <= cutoff_time:
-                    volume_at_cutoff = volume  # Keep updating until we pass the cutoff
-                elif record_time > cutoff_time:
-                    # This is within our timeframe, keep the latest volume
-                    current_volume = volume
+        # Records up to split are at or before the cutoff, the rest are within our timeframe
+        split = bisect.bisect_right(times, cutoff_time)
+        volume_at_cutoff = self._last_volume(records, 0, split)
+        current_volume = self._last_volume(records, split, len(records))
+        first_available_volume = next((r['volume'] for r in records if r.get('volume') is not None), None)
 
         # Use fallback logic if we don't have volume at cutoff
         if volume_at_cutoff is None:
@@ -246,13 +337,9 @@ class StockTradingBot:
 
         # If we still don't have current volume, use the latest available
         if current_volume is None:
-            # Find the latest volume from all data
-            for record_time, record in reversed(timestamped_data):
-                volume = record.get('volume')
-                if volume is not None:
-                    current_volume = volume
-                    logger.info(f"Using latest available volume as current: {current_volume}")
-                    break
+            current_volume = self._last_volume(records, 0, len(records))
+            if current_volume is not None:
+                logger.info(f"Using latest available volume as current: {current_volume}")
 
         if volume_at_cutoff is None or current_volume is None:
             logger.info(f"Insufficient data to calculate volume increase for {minutes} minutes - "
@@ -267,18 +354,32 @@ class StockTradingBot:
                 f"(from {volume_at_cutoff} to {current_volume})")
         return max(0, volume_increase)  # Return 0 if volume decreased
     
-    def check_volume_requirements(self, data: List[Dict], volume_requirements: List[Tuple[int, int]], 
-                             volume_multiplier: float = 1.0) -> bool:
+    @staticmethod
+    def _last_volume(records: List[Dict], start: int, end: int) -> Optional[int]:
+        """Latest non-missing volume in records[start:end], walking back from the end"""
+        for i in range(end - 1, start - 1, -1):
+            volume = records[i].get('volume')
+            if volume is not None:
+                return volume
+        return None
+    
+    def check_volume_requirements(self, snapshot: HistorySnapshot, volume_requirements: List[Tuple[int, int]], 
+                             volume_multiplier: float = 1.0, now: Optional[datetime] = None) -> bool:
         """Check if volume requirements are met"""
         if not volume_requirements:
             logger.info("   No volume requirements specified - PASSED")
             return True
         
+        if volume_multiplier <= 0:
+            # Every scaled requirement is 0, which any volume increase meets
+            logger.info(f"   Volume multiplier is {volume_multiplier}x - requirements waived - PASSED")
+            return True
+        
         logger.info(f"   Checking {len(volume_requirements)} volume requirement(s) with {volume_multiplier}x multiplier:")
         
         all_passed = True
         for i, (minutes, required_volume) in enumerate(volume_requirements, 1):
-            actual_volume_increase = self.calculate_volume_increase_in_timeframe(data, minutes)
+            actual_volume_increase = self.calculate_volume_increase_in_timeframe(snapshot, minutes, now)
             logger.info(f"   Raw calculated increase for {minutes if minutes != -1 else 'day'}: {actual_volume_increase}")
             
             # If we couldn't calculate volume increase, fail the check
@@ -297,19 +398,19 @@ class StockTradingBot:
         logger.info(f"   Overall volume requirements: {'PASSED' if all_passed else 'FAILED'}")
         return all_passed
     
-    def check_price_momentum(self, data: List[Dict], recent_interval_seconds: int = 20, 
+    def check_price_momentum(self, snapshot: HistorySnapshot, recent_interval_seconds: int = 20, 
                            historical_interval_seconds: int = 600, 
-                           required_increase_percent: float = 0.05) -> bool:
+                           required_increase_percent: float = 0.05, now: Optional[datetime] = None) -> bool:
         """Check if price momentum condition is met"""
-        unique_data = self.filter_unique_prices(data)
+        unique_times, unique_data = snapshot.unique_times, snapshot.unique_records
         
         logger.info(f"Total unique data points: {len(unique_data)}")
         
         # Get data for recent interval
-        recent_data = self.get_data_in_time_range(unique_data, recent_interval_seconds, 0)
+        recent_data = self.get_data_in_time_range(unique_times, unique_data, recent_interval_seconds, 0, now)
         
         # Get data for historical interval
-        historical_data = self.get_data_in_time_range(unique_data, historical_interval_seconds, recent_interval_seconds)
+        historical_data = self.get_data_in_time_range(unique_times, unique_data, historical_interval_seconds, recent_interval_seconds, now)
         
         logger.info(f"Recent data points (last {recent_interval_seconds}s): {len(recent_data)}")
         logger.info(f"Historical data points ({recent_interval_seconds}s-{historical_interval_seconds}s ago): {len(historical_data)}")
@@ -380,9 +481,11 @@ class StockTradingBot:
         
         return condition_met
     
-    def get_pivot_position(self, current_price: float, lower_price: float, higher_price: float) -> str:
+    def get_pivot_position(self, current_price: float, lower_price: float, higher_price: float,
+                           pivot_range: Optional[float] = None) -> str:
         """Determine which part of the pivot range the current price is in"""
-        pivot_range = higher_price - lower_price
+        if pivot_range is None:
+            pivot_range = higher_price - lower_price
         price_position = (current_price - lower_price) / pivot_range
         
         if price_position <= 0.5:
@@ -403,12 +506,13 @@ class StockTradingBot:
         return pivot_position in time_in_pivot_positions
     
     def check_time_in_pivot_requirement(self, current_price: float, lower_price: float, higher_price: float,
-                                       time_in_pivot_seconds: int, time_in_pivot_positions: List[str]) -> bool:
+                                       time_in_pivot_seconds: int, time_in_pivot_positions: List[str],
+                                       now: Optional[datetime] = None) -> bool:
         """Check if price has been in specified pivot positions for required time"""
         if time_in_pivot_seconds <= 0:
             return True  # No time requirement
         
-        current_time = datetime.now()
+        current_time = now if now is not None else datetime.now()
         
         # Check if price is currently in pivot range
         if current_price < lower_price or current_price > higher_price:
@@ -447,7 +551,8 @@ class StockTradingBot:
                 "higher_price": higher_price
             }
             
-            response = requests.post(f"{self.trade_server_url}/execute_trade", json=payload)
+            # No timeout: the trade server only answers once the whole trade has been processed
+            response = self.session.post(f"{self.trade_server_url}/execute_trade", json=payload)
             
             if response.status_code == 200:
                 logger.info(f"Trade executed successfully for {ticker}")
@@ -460,6 +565,13 @@ class StockTradingBot:
             time.sleep(10)
             return False
     
+    def _sleep_with_prefetch(self, symbol: str, seconds: float) -> Future:
+        """Sleep until the next poll, sending its history request just early enough to be ready on wake"""
+        time.sleep(max(0.0, seconds - self.PREFETCH_LEAD))
+        prefetched = self._prefetch_pool.submit(self._fetch_history, symbol)
+        time.sleep(min(seconds, self.PREFETCH_LEAD))
+        return prefetched
+    
     def monitor_and_trade(self, ticker: str, lower_price: float, higher_price: float,
                      volume_requirements: List[Tuple[int, int]], pivot_adjustment: float = 0.0,
                      recent_interval_seconds: int = 20, historical_interval_seconds: int = 600,
@@ -471,6 +583,11 @@ class StockTradingBot:
         
         if time_in_pivot_positions is None:
             time_in_pivot_positions = []
+        if volume_multipliers is None:
+            volume_multipliers = [1.0, 0.75, 0.5]
+        
+        # The pivot geometry is fixed for the whole run
+        pivot_range = adjusted_higher_price - lower_price
         
         logger.info(f"Starting monitoring for {ticker}")
         logger.info(f"Pivot range: {lower_price} - {adjusted_higher_price}")
@@ -487,6 +604,7 @@ class StockTradingBot:
         
         cycle_count = 0
         start_time = datetime.now()
+        prefetched = None
         
         while self.running:
             try:
@@ -496,11 +614,13 @@ class StockTradingBot:
                 logger.info(f"MONITORING CYCLE #{cycle_count} - {cycle_start.strftime('%H:%M:%S.%f')[:-3]}")
                 logger.info(f"{'='*60}")
                 
-                # Get current data
-                latest_data = self.get_latest_data(ticker)
+                # One request per poll: the newest history record is exactly what /latest returns
+                historical_data = self.get_ticker_data(ticker, prefetched)
+                prefetched = None
+                latest_data = historical_data[-1] if historical_data else None
                 if not latest_data:
                     logger.warning(f"No latest data available for {ticker}")
-                    time.sleep(5)
+                    prefetched = self._sleep_with_prefetch(ticker, 5)
                     continue
                 
                 current_price = latest_data.get('currentPrice')
@@ -509,7 +629,7 @@ class StockTradingBot:
                 
                 if current_price is None:
                     logger.warning(f"No current price available for {ticker}")
-                    time.sleep(5)
+                    prefetched = self._sleep_with_prefetch(ticker, 5)
                     continue
                 
                 if current_price < lower_price or current_price > adjusted_higher_price:
@@ -518,26 +638,29 @@ class StockTradingBot:
                     else:
                         logger.info(f"Price {current_price} is ABOVE pivot range (min: {lower_price}, max: {adjusted_higher_price}) - difference: {current_price - adjusted_higher_price:.4f}")
                     self.pivot_entry_time = None  # Reset timer when out of range
-                    time.sleep(5)
+                    
+                    # More than a pivot's width away: back off exponentially, otherwise keep the normal pace
+                    distance = lower_price - current_price if current_price < lower_price else current_price - adjusted_higher_price
+                    if distance > adjusted_higher_price - lower_price:
+                        self._out_of_range_sleep = min(self._out_of_range_sleep * 2, self.MAX_OUT_OF_RANGE_SLEEP)
+                        logger.info(f"Price far outside pivot range, next check in {self._out_of_range_sleep}s")
+                    else:
+                        self._out_of_range_sleep = self.OUT_OF_RANGE_SLEEP
+                    prefetched = self._sleep_with_prefetch(ticker, self._out_of_range_sleep)
                     continue
+                
+                self._out_of_range_sleep = self.OUT_OF_RANGE_SLEEP
 
                 logger.info(f"✓ Price {current_price} is IN pivot range [{lower_price}, {adjusted_higher_price}]")
                 
-                # Get historical data for analysis
-                historical_data = self.get_ticker_data(ticker)
-                if not historical_data:
-                    logger.warning(f"No historical data available for {ticker}")
-                    time.sleep(5)
-                    continue
+                # Parsed and de-duplicated history, maintained incrementally by get_ticker_data
+                snapshot = self._snapshots[ticker]
+                now = datetime.now()  # taken after the fetch; every check in this cycle measures against it
                 
                 ## Determine pivot position and volume multiplier
-                pivot_position = self.get_pivot_position(current_price, lower_price, adjusted_higher_price)
-                pivot_range = adjusted_higher_price - lower_price
+                pivot_position = self.get_pivot_position(current_price, lower_price, adjusted_higher_price, pivot_range)
                 price_position_percent = ((current_price - lower_price) / pivot_range) * 100
 
-                if volume_multipliers is None:
-                    volume_multipliers = [1.0, 0.75, 0.5]
-
                 if pivot_position == "lower":
                     volume_multiplier = volume_multipliers[0]
                 elif pivot_position == "middle":
@@ -582,8 +705,8 @@ class StockTradingBot:
                 # 3. Check price momentum
                 if conditions_met:
                     logger.info("3. Checking price momentum...")
-                    if not self.check_price_momentum(historical_data, recent_interval_seconds, 
-                                                historical_interval_seconds, required_increase_percent):
+                    if not self.check_price_momentum(snapshot, recent_interval_seconds, 
+                                                historical_interval_seconds, required_increase_percent, now):
                         conditions_met = False
                         failed_conditions.append("momentum")
                         logger.info("   ❌ Price momentum condition FAILED")
@@ -595,7 +718,7 @@ class StockTradingBot:
                 # 4. Check volume requirements
                 if conditions_met:
                     logger.info("4. Checking volume requirements...")
-                    if not self.check_volume_requirements(historical_data, volume_requirements, volume_multiplier):
+                    if not self.check_volume_requirements(snapshot, volume_requirements, volume_multiplier, now):
                         conditions_met = False
                         failed_conditions.append("volume")
                         logger.info("   ❌ Volume requirements FAILED")
@@ -608,7 +731,7 @@ class StockTradingBot:
                 if conditions_met:
                     logger.info("5. Checking time-in-pivot requirement...")
                     if not self.check_time_in_pivot_requirement(current_price, lower_price, adjusted_higher_price,
-                                                            time_in_pivot_seconds, time_in_pivot_positions):
+                                                            time_in_pivot_seconds, time_in_pivot_positions, now):
                         conditions_met = False
                         failed_conditions.append("time_in_pivot")
                         logger.info("   ❌ Time-in-pivot requirement FAILED")
@@ -628,7 +751,7 @@ class StockTradingBot:
                 else:
                     logger.info(f"❌ CONDITIONS NOT MET - Failed: {', '.join(failed_conditions)}")
                 
-                time.sleep(2)  # Check every 2 seconds
+                prefetched = self._sleep_with_prefetch(ticker, 2)  # Check every 2 seconds
                 
             except KeyboardInterrupt:
                 logger.info("Stopping due to keyboard interrupt")
@@ -646,8 +769,8 @@ def parse_volume_requirements(volume_args: List[str]) -> List[Tuple[int, int]]:
     
     for arg in volume_args:
         try:
-            if '=' in arg:
-                time_part, volume_part = arg.split('=', 1)
+            time_part, sep, volume_part = arg.partition('=')
+            if sep:
                 if time_part.lower() == 'day':
                     minutes = -1
                 else:
@@ -680,8 +803,7 @@ def parse_pivot_positions(positions_str: str) -> List[str]:
   
 def is_market_open() -> bool:
     """Check if the market is currently open (9:30 AM - 4:00 PM ET, Monday-Friday)"""
-    et = pytz.timezone('US/Eastern')
-    now = datetime.now(et)
+    now = datetime.now(ET)
     
     # Check if it's a weekday (Monday=0, Sunday=6)
     if now.weekday() > 4:  # Saturday or Sunday
@@ -696,8 +818,7 @@ def is_market_open() -> bool:
   
 def minutes_until_market_open() -> int:
     """Calculate minutes until next market open"""
-    et = pytz.timezone('US/Eastern')
-    now = datetime.now(et)
+    now = datetime.now(ET)
     
     # If it's weekend, calculate time until Monday 9:30 AM
     if now.weekday() > 4:  # Saturday or Sunday
@@ -726,8 +847,7 @@ def wait_for_market_open():
         logger.info("Market is already open!")
         return
     
-    et = pytz.timezone('US/Eastern')
-    now = datetime.now(et)
+    now = datetime.now(ET)
     
     # Calculate next market open time
     if now.weekday() > 4:  # Weekend
@@ -1,38 +1,72 @@
 import yfinance as yf
+import requests
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from collections import deque
 from datetime import datetime, timezone, date, timedelta
-from flask import Flask, jsonify, request
+from flask import Flask, Response, request
 import json
 import logging
 import flask_cors
 import pytz
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj) -> bytes:
+    """Serialize a response body, using orjson when available"""
+    # default=float covers float subclasses such as numpy.float64, which orjson rejects but json accepts
+    return orjson.dumps(obj, default=float) if orjson else json.dumps(obj).encode()
+
 class StockDataServer:
     def __init__(self):
         self.tickers = []
+        self.ticker_set = set()  # Same symbols as self.tickers, for O(1) membership checks
+        self.lock = threading.RLock()  # Guards the ticker list and every ticker's record deque
         self.ticker_data = {}  # {ticker: deque of records}
+        self.data_snapshots = {}  # {ticker: tuple copy of its deque}, dropped whenever the deque changes
         self.ticker_initial_prices = {}  # Store initial prices for each ticker
-        self.current_ticker_index = 0
+        self.yf_tickers = {}  # {ticker: yf.Ticker} reused by the yfinance fallback
         self.max_records = 10000
         self.max_requests_per_minute = 120
         self.request_interval = 60 / self.max_requests_per_minute  # 0.5 seconds between requests
+        self.rate_lock = threading.Lock()  # Guards next_request_at
+        self.next_request_at = 0.0  # time.monotonic() of the next free request slot, shared by all fetch threads
+        self.quote_batch_size = 20  # symbols per Yahoo quote request
         self.running = False
         self.data_thread = None
+        self.fetch_executor = None  # Runs the quote requests of a round concurrently
+        self.max_fetch_workers = 8
         self.market_check_interval = 30  # Check market status every 30 seconds when closed
         self.last_cleanup_date = None
         self.market_just_opened = False
         self.last_market_status = None
+        self.market_hours_date = None  # ET date that market_hours was computed for
+        self.market_hours = None  # (open, close) datetimes in ET
+        self.market_status_ttl = 0.5  # seconds a computed /market-status, /status answer is reused
+        self.market_status_cache = (0.0, None)  # (time.monotonic() when computed, status dict)
         
         # Define timezones
         self.et_tz = pytz.timezone('America/New_York')  # NYSE/NASDAQ timezone
         self.local_tz = pytz.timezone('Europe/Bucharest')  # Romanian timezone
         
+        # Keep-alive session for Yahoo's quote endpoint; it needs a cookie and matching crumb
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Mozilla/5.0'
+        self.crumb = None
+        self.crumb_time = 0.0  # time.monotonic() when the crumb was negotiated
+        self.crumb_max_age = 3600  # Renegotiate hourly even if Yahoo keeps accepting it
+        self.crumb_lock = threading.Lock()
+        self.quote_lock = threading.Lock()  # Guards the quote backoff shared by the batch threads
+        self.quote_backoff = 0  # seconds quote requests are paused for after the latest failure
+        self.quote_retry_at = 0.0  # time.monotonic() before which quote requests are skipped
+        
     def get_current_et_time(self):
         """Get current time in Eastern Time"""
         return datetime.now(self.et_tz)
@@ -52,8 +86,7 @@ class StockDataServer:
                 return False, self.get_time_until_next_open(et_now)
             
             # Regular market hours: 9:30 AM - 4:00 PM ET
-            market_open_time = et_now.replace(hour=9, minute=30, second=0, microsecond=0)
-            market_close_time = et_now.replace(hour=16, minute=0, second=0, microsecond=0)
+            market_open_time, market_close_time = self.get_market_hours(et_now)
             
             # Check if current time is within market hours
             is_open = market_open_time <= et_now <= market_close_time
@@ -71,6 +104,16 @@ class StockDataServer:
                 return True, None
             return False, timedelta(hours=1)  # Default wait time
     
+    def get_market_hours(self, et_now):
+        """Get today's open and close times in ET, computed once per date"""
+        if self.market_hours_date != et_now.date():
+            self.market_hours = (
+                et_now.replace(hour=9, minute=30, second=0, microsecond=0),
+                et_now.replace(hour=16, minute=0, second=0, microsecond=0)
+            )
+            self.market_hours_date = et_now.date()
+        return self.market_hours
+    
     def get_time_until_next_open(self, current_et_time):
         """Calculate time until next market open in ET"""
         try:
@@ -136,33 +179,35 @@ class StockDataServer:
         cleaned_tickers = 0
         total_removed = 0
         
-        for symbol in self.tickers:
-            if symbol in self.ticker_data:
-                original_count = len(self.ticker_data[symbol])
+        with self.lock:
+            for symbol in self.tickers:
+                if symbol in self.ticker_data:
+                    original_count = len(self.ticker_data[symbol])
                 
-                # Filter to keep only today's records (in ET)
-                today_records = deque(maxlen=self.max_records)
-                for record in self.ticker_data[symbol]:
-                    try:
-                        # Parse timestamp and convert to ET for comparison
-                        record_dt = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00'))
-                        if record_dt.tzinfo is None:
-                            record_dt = record_dt.replace(tzinfo=timezone.utc)
-                        record_et = record_dt.astimezone(self.et_tz)
-                        record_date = record_et.date()
+                    # Filter to keep only today's records (in ET)
+                    today_records = deque(maxlen=self.max_records)
+                    for record in self.ticker_data[symbol]:
+                        try:
+                            # Parse timestamp and convert to ET for comparison
+                            record_dt = datetime.fromisoformat(record['timestamp'].replace('Z', '+00:00'))
+                            if record_dt.tzinfo is None:
+                                record_dt = record_dt.replace(tzinfo=timezone.utc)
+                            record_et = record_dt.astimezone(self.et_tz)
+                            record_date = record_et.date()
                         
-                        if record_date == today_et:
-                            today_records.append(record)
-                    except (ValueError, KeyError, AttributeError) as e:
-                        logger.warning(f"Skipping malformed record: {e}")
-                        continue
+                            if record_date == today_et:
+                                today_records.append(record)
+                        except (ValueError, KeyError, AttributeError) as e:
+                            logger.warning(f"Skipping malformed record: {e}")
+                            continue
                 
-                self.ticker_data[symbol] = today_records
-                removed_count = original_count - len(today_records)
+                    self.ticker_data[symbol] = today_records
+                    self.data_snapshots.pop(symbol, None)
+                    removed_count = original_count - len(today_records)
                 
-                if removed_count > 0:
-                    total_removed += removed_count
-                    cleaned_tickers += 1
+                    if removed_count > 0:
+                        total_removed += removed_count
+                        cleaned_tickers += 1
         
         if cleaned_tickers > 0:
             logger.info(f"Cleaned up {total_removed} old records from {cleaned_tickers} tickers")
@@ -172,6 +217,8 @@ class StockDataServer:
     def add_initial_market_open_record(self, symbol, current_price):
         """Add an initial record with volume 0 when market opens"""
         try:
+            current_price = float(current_price)  # yfinance history values are numpy.float64
+            
             # Create initial record with volume 0
             initial_record = {
                 'symbol': symbol,
@@ -183,9 +230,11 @@ class StockDataServer:
             }
             
             # Clear existing data and add the initial record
-            self.ticker_data[symbol].clear()
-            self.ticker_data[symbol].append(initial_record)
-            self.ticker_initial_prices[symbol] = current_price
+            with self.lock:
+                self.ticker_data[symbol].clear()
+                self.ticker_data[symbol].append(initial_record)
+                self.data_snapshots.pop(symbol, None)
+                self.ticker_initial_prices[symbol] = current_price
             
             logger.info(f"Added market open record for {symbol}: ${current_price} with volume 0")
             
@@ -195,30 +244,160 @@ class StockDataServer:
     def add_ticker(self, symbol):
         """Add a ticker to the monitoring list"""
         symbol = symbol.upper().strip()
-        if symbol and symbol not in self.tickers:
+        with self.lock:
+            if not symbol or symbol in self.ticker_set:
+                return False
+            self.ticker_set.add(symbol)
             self.tickers.append(symbol)
             self.ticker_data[symbol] = deque(maxlen=self.max_records)
             self.ticker_initial_prices[symbol] = None
-            logger.info(f"Added ticker: {symbol}")
-            return True
-        return False
+            self.yf_tickers[symbol] = yf.Ticker(symbol)
+        logger.info(f"Added ticker: {symbol}")
+        return True
     
     def remove_ticker(self, symbol):
         """Remove a ticker from the monitoring list"""
         symbol = symbol.upper().strip()
-        if symbol in self.tickers:
+        with self.lock:
+            if symbol not in self.ticker_set:
+                return False
+            self.ticker_set.discard(symbol)
             self.tickers.remove(symbol)
             del self.ticker_data[symbol]
+            self.data_snapshots.pop(symbol, None)
             if symbol in self.ticker_initial_prices:
                 del self.ticker_initial_prices[symbol]
-            logger.info(f"Removed ticker: {symbol}")
-            return True
-        return False
+            self.yf_tickers.pop(symbol, None)
+        logger.info(f"Removed ticker: {symbol}")
+        return True
     
-    def fetch_ticker_data(self, symbol):
-        """Fetch data for a single ticker"""
+    def wait_for_request_slot(self):
+        """Block until this thread may send a Yahoo request, keeping every fetch path within max_requests_per_minute"""
+        with self.rate_lock:
+            now = time.monotonic()
+            slot = max(now, self.next_request_at)
+            self.next_request_at = slot + self.request_interval
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def get_crumb(self, rejected=None):
+        """Get the crumb Yahoo requires on quote requests, renegotiating it when missing, expired or rejected"""
+        with self.crumb_lock:
+            expired = time.monotonic() - self.crumb_time > self.crumb_max_age
+            # A crumb another thread already renegotiated is not `rejected`, so it is reused
+            if self.crumb is None or expired or self.crumb == rejected:
+                self.session.cookies.clear()
+                self.session.get('https://fc.yahoo.com', timeout=10)  # Only sets the cookie; the status is irrelevant
+                response = self.session.get('https://query1.finance.yahoo.com/v1/test/getcrumb', timeout=10)
+                response.raise_for_status()
+                self.crumb = response.text.strip()
+                self.crumb_time = time.monotonic()
+            return self.crumb
+    
+    def fetch_quotes(self, symbols):
+        """Fetch quotes for several tickers in one request, keyed by symbol; None if the request failed or is backing off"""
+        with self.quote_lock:
+            if time.monotonic() < self.quote_retry_at:
+                return None
+        
         try:
-            ticker = yf.Ticker(symbol)
+            crumb = self.get_crumb()
+            for attempt in range(2):
+                self.wait_for_request_slot()
+                response = self.session.get(
+                    'https://query1.finance.yahoo.com/v7/finance/quote',
+                    params={'symbols': ','.join(symbols), 'crumb': crumb},
+                    timeout=10
+                )
+                if response.status_code not in (401, 403) or attempt:
+                    break
+                # The cookie or crumb has expired; renegotiate once and retry
+                logger.info(f"Quote request rejected ({response.status_code}), refreshing Yahoo crumb")
+                crumb = self.get_crumb(rejected=crumb)
+            
+            if response.status_code != 200:
+                self.back_off_quotes(f"Quote request for {len(symbols)} tickers failed: {response.status_code}")
+                return None
+            results = response.json().get('quoteResponse', {}).get('result') or []
+            with self.quote_lock:
+                self.quote_backoff = 0
+            return {quote.get('symbol'): quote for quote in results}
+        except Exception as e:
+            self.back_off_quotes(f"Quote request for {len(symbols)} tickers failed: {e}")
+            return None
+    
+    def back_off_quotes(self, reason):
+        """Pause quote requests (and crumb renegotiation) for an exponentially growing interval, up to 5 minutes"""
+        with self.quote_lock:
+            now = time.monotonic()
+            if now < self.quote_retry_at:
+                return  # Another batch of the same round already backed off
+            self.quote_backoff = min(max(self.quote_backoff * 2, 5), 300)
+            self.quote_retry_at = now + self.quote_backoff
+            backoff = self.quote_backoff
+        logger.warning(f"{reason} - pausing quote requests for {backoff}s")
+    
+    def fetch_batch(self, symbols, round_no=0):
+        """Fetch data for a batch of tickers, falling back to yfinance for any a successful quote response missed"""
+        quotes = self.fetch_quotes(symbols)
+        if quotes is None:
+            # Quote endpoint unavailable: fetch a single ticker per batch through yfinance, the same
+            # one-symbol-per-interval budget the per-ticker loop kept, rotating through the batch by round
+            self.fetch_ticker_data_yfinance(symbols[round_no % len(symbols)])
+            return
+        
+        timestamp = datetime.now(timezone.utc).isoformat()  # One response, one instant for all its quotes
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote and quote.get('regularMarketPrice') is not None:
+                try:
+                    self.store_record(symbol, quote['regularMarketPrice'], quote.get('regularMarketDayHigh'),
+                                      quote.get('regularMarketDayLow'), quote.get('regularMarketVolume'), timestamp)
+                except Exception as e:
+                    logger.error(f"Error storing data for {symbol}: {str(e)}")
+            else:
+                self.fetch_ticker_data_yfinance(symbol)
+    
+    def store_record(self, symbol, current_price, day_high, day_low, volume, timestamp=None):
+        """Append a fetched quote to the ticker's history unless it repeats the previous one"""
+        record = {
+            'symbol': symbol,
+            'timestamp': timestamp or datetime.now(timezone.utc).isoformat(),
+            'currentPrice': float(current_price),
+            'dayHigh': float(day_high) if day_high is not None else float(current_price),
+            'dayLow': float(day_low) if day_low is not None else float(current_price),
+            'volume': int(volume) if volume is not None else 0
+        }
+        
+        with self.lock:
+            records = self.ticker_data.get(symbol)
+            if records is None:
+                return  # Removed while the fetch was in flight
+            
+            # If market just opened and we don't have an initial price, add initial record
+            if self.market_just_opened and self.ticker_initial_prices.get(symbol) is None:
+                self.add_initial_market_open_record(symbol, record['currentPrice'])
+                return  # Don't add the regular record yet
+            
+            # Check for duplicates before adding (skip if same price and volume)
+            last = records[-1] if records else None
+            is_new = last is None or (
+                last['volume'] != record['volume'] or
+                abs(last['currentPrice'] - record['currentPrice']) > 0.001
+            )
+            if is_new:
+                records.append(record)
+                self.data_snapshots.pop(symbol, None)
+        
+        if is_new:
+            logger.info(f"Fetched data for {symbol}: ${record['currentPrice']:.4f} | volume {record['volume']} | time {record['timestamp'][:19]}")
+        else:
+            logger.debug(f"Skipped duplicate data for {symbol}")
+    
+    def fetch_ticker_data_yfinance(self, symbol):
+        """Fetch data for a single ticker through yfinance's info/history calls"""
+        try:
+            ticker = self.yf_tickers.get(symbol) or yf.Ticker(symbol)
             
             # Use multiple methods to get current price
             current_price = None
@@ -228,6 +407,7 @@ class StockDataServer:
             
             # Try getting from info first
             try:
+                self.wait_for_request_slot()
                 info = ticker.info
                 current_price = info.get('currentPrice') or info.get('regularMarketPrice')
                 volume = info.get('volume') or info.get('regularMarketVolume')
@@ -239,6 +419,7 @@ class StockDataServer:
             # If info didn't work, try history
             if current_price is None:
                 try:
+                    self.wait_for_request_slot()
                     hist = ticker.history(period="1d", interval="1m")
                     if not hist.empty:
                         latest = hist.iloc[-1]
@@ -253,37 +434,16 @@ class StockDataServer:
                 logger.warning(f"No price data available for {symbol}")
                 return
             
-            record = {
-                'symbol': symbol,
-                'timestamp': datetime.now(timezone.utc).isoformat(),
-                'currentPrice': float(current_price),
-                'dayHigh': float(day_high) if day_high is not None else float(current_price),
-                'dayLow': float(day_low) if day_low is not None else float(current_price),
-                'volume': int(volume) if volume is not None else 0
-            }
-            
-            # If market just opened and we don't have an initial price, add initial record
-            if self.market_just_opened and self.ticker_initial_prices.get(symbol) is None:
-                self.add_initial_market_open_record(symbol, current_price)
-                return  # Don't add the regular record yet
-            
-            # Check for duplicates before adding (skip if same price and volume)
-            if not self.ticker_data[symbol] or (
-                abs(self.ticker_data[symbol][-1]['currentPrice'] - record['currentPrice']) > 0.001 or 
-                self.ticker_data[symbol][-1]['volume'] != record['volume']
-            ):
-                self.ticker_data[symbol].append(record)
-                logger.info(f"Fetched data for {symbol}: ${record['currentPrice']:.4f} | volume {record['volume']} | time {record['timestamp'][:19]}")
-            else:
-                logger.debug(f"Skipped duplicate data for {symbol}")
+            self.store_record(symbol, current_price, day_high, day_low, volume)
                 
         except Exception as e:
             logger.error(f"Error fetching data for {symbol}: {str(e)}")
     
     def data_collection_loop(self):
-        """Main loop for collecting data in round-robin fashion"""
+        """Main loop for collecting data in batches of tickers"""
         consecutive_errors = 0
         max_consecutive_errors = 5
+        round_no = 0
         
         while self.running:
             try:
@@ -308,8 +468,9 @@ class StockDataServer:
                     time.sleep(15)
                     logger.info("15-second delay complete. Will add initial records with volume 0.")
                     # Reset initial prices for all tickers
-                    for symbol in self.tickers:
-                        self.ticker_initial_prices[symbol] = None
+                    with self.lock:
+                        for symbol in self.tickers:
+                            self.ticker_initial_prices[symbol] = None
                 else:
                     self.market_just_opened = False
                 
@@ -325,22 +486,20 @@ class StockDataServer:
                     time.sleep(5)
                     continue
                 
-                # Get next ticker in round-robin fashion
-                if self.current_ticker_index >= len(self.tickers):
-                    self.current_ticker_index = 0
-                
-                current_ticker = self.tickers[self.current_ticker_index]
-                self.fetch_ticker_data(current_ticker)
-                
-                # Move to next ticker
-                self.current_ticker_index += 1
+                # One quote request per batch; every request, including the yfinance fallbacks, waits for
+                # its slot under the request cap, and each round finishes before the next starts
+                with self.lock:
+                    tickers = list(self.tickers)
+                futures = [
+                    self.fetch_executor.submit(self.fetch_batch, tickers[i:i + self.quote_batch_size], round_no)
+                    for i in range(0, len(tickers), self.quote_batch_size)
+                ]
+                wait(futures)
+                round_no += 1
                 
                 # Reset error counter on success
                 consecutive_errors = 0
                 
-                # Wait for the interval
-                time.sleep(self.request_interval)
-                
             except Exception as e:
                 consecutive_errors += 1
                 logger.error(f"Error in data collection loop (#{consecutive_errors}): {str(e)}")
@@ -356,6 +515,7 @@ class StockDataServer:
         """Start the data collection"""
         if not self.running:
             self.running = True
+            self.fetch_executor = ThreadPoolExecutor(max_workers=self.max_fetch_workers)
             self.data_thread = threading.Thread(target=self.data_collection_loop)
             self.data_thread.daemon = True
             self.data_thread.start()
@@ -367,37 +527,66 @@ class StockDataServer:
             self.running = False
             if self.data_thread and self.data_thread.is_alive():
                 self.data_thread.join(timeout=5)
+            if self.fetch_executor:
+                self.fetch_executor.shutdown(wait=False)
             logger.info("Data collection stopped")
     
-    def get_ticker_data(self, symbol):
-        """Get all data for a ticker"""
+    def get_ticker_data(self, symbol, since=None, limit=None):
+        """Get all data for a ticker, or only records newer than the `since` timestamp and/or the last `limit` records
+        
+        Returns (records, total stored record count) read under one lock, or None for an unknown ticker.
+        """
         symbol = symbol.upper().strip()
-        if symbol in self.ticker_data:
-            return list(self.ticker_data[symbol])
-        return None
+        with self.lock:
+            records = self.ticker_data.get(symbol)
+            if records is None:
+                return None
+            total_count = len(records)
+            if since is None and limit is None:
+                # Immutable, so every reader of the full history can share one copy until the next append
+                snapshot = self.data_snapshots.get(symbol)
+                if snapshot is None:
+                    snapshot = self.data_snapshots[symbol] = tuple(records)
+                return snapshot, total_count
+            
+            # Records are appended in time order with same-format UTC ISO timestamps, so walk back
+            # from the end and copy only the tail that is asked for
+            tail = []
+            for record in reversed(records):
+                if (limit is not None and len(tail) >= limit) or (since is not None and record['timestamp'] <= since):
+                    break
+                tail.append(record)
+        tail.reverse()
+        return tail, total_count
     
     def get_latest_data(self, symbol):
         """Get the latest data point for a ticker"""
         symbol = symbol.upper().strip()
-        if symbol in self.ticker_data and self.ticker_data[symbol]:
-            return self.ticker_data[symbol][-1]
-        return None
+        with self.lock:
+            records = self.ticker_data.get(symbol)
+            return records[-1] if records else None
     
     def get_market_status(self):
-        """Get current market status with local time information"""
+        """Get current market status with local time information, reusing one computed within market_status_ttl"""
+        cached_at, status = self.market_status_cache
+        if status is not None and time.monotonic() - cached_at < self.market_status_ttl:
+            return status
+        
         market_open, time_until_open = self.is_market_open()
         
         # Add current time information
         et_time = self.get_current_et_time()
         local_time = self.get_current_local_time()
         
-        return {
+        status = {
             'is_open': market_open,
             'message': "Market is open" if market_open else self.format_time_until_open(time_until_open),
             'current_et_time': et_time.strftime('%Y-%m-%d %H:%M:%S %Z'),
             'current_local_time': local_time.strftime('%Y-%m-%d %H:%M:%S %Z'),
             'next_open_local': None if market_open else (et_time + time_until_open).astimezone(self.local_tz).strftime('%Y-%m-%d %H:%M:%S %Z')
         }
+        self.market_status_cache = (time.monotonic(), status)
+        return status
 
 # Initialize the server
 stock_server = StockDataServer()
@@ -406,10 +595,16 @@ stock_server = StockDataServer()
 app = Flask(__name__)
 flask_cors.CORS(app)  # Enable CORS for all routes
 
+@app.url_value_preprocessor
+def normalize_symbol(endpoint, values):
+    """Upper-case the <symbol> URL segment once, before any handler sees it"""
+    if values and 'symbol' in values:
+        values['symbol'] = values['symbol'].upper().strip()
+
 @app.route('/tickers', methods=['GET'])
 def get_tickers():
     """Get list of all monitored tickers"""
-    return jsonify({
+    return json_response({
         'tickers': stock_server.tickers,
         'total_count': len(stock_server.tickers)
     })
@@ -420,45 +615,63 @@ def add_ticker():
     try:
         data = request.get_json()
         if not data or 'symbol' not in data:
-            return jsonify({'error': 'Symbol is required'}), 400
+            return json_response({'error': 'Symbol is required'}), 400
         
         symbol = data['symbol']
         if stock_server.add_ticker(symbol):
-            return jsonify({'message': f'Ticker {symbol.upper()} added successfully'})
+            return json_response({'message': f'Ticker {symbol.upper()} added successfully'})
         else:
-            return jsonify({'message': f'Ticker {symbol.upper()} already exists'})
+            return json_response({'message': f'Ticker {symbol.upper()} already exists'})
     except Exception as e:
         logger.error(f"Error adding ticker: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/tickers/<symbol>', methods=['DELETE'])
 def remove_ticker(symbol):
     """Remove a ticker from monitoring"""
     try:
         if stock_server.remove_ticker(symbol):
-            return jsonify({'message': f'Ticker {symbol.upper()} removed successfully'})
+            return json_response({'message': f'Ticker {symbol} removed successfully'})
         else:
-            return jsonify({'error': f'Ticker {symbol.upper()} not found'}), 404
+            return json_response({'error': f'Ticker {symbol} not found'}), 404
     except Exception as e:
         logger.error(f"Error removing ticker: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
+
+def json_response(obj):
+    """Build a JSON response without going through Flask's stdlib-json provider"""
+    return Response(_json_dumps(obj), mimetype='application/json')
+
+def stream_ticker_data(symbol, data, total_count, chunk_size=500):
+    """Yield the /data response body a chunk of records at a time instead of encoding it all at once"""
+    header = _json_dumps({'symbol': symbol, 'record_count': len(data), 'total_count': total_count})
+    yield header[:-1] + b',"data":['
+    for i in range(0, len(data), chunk_size):
+        if i:
+            yield b','
+        yield _json_dumps(data[i:i + chunk_size])[1:-1]
+    yield b']}'
 
 @app.route('/data/<symbol>', methods=['GET'])
 def get_ticker_data(symbol):
-    """Get all historical data for a ticker"""
+    """Get all historical data for a ticker (only records after ?since=<timestamp> and/or the last ?limit=<n> if given)"""
     try:
-        data = stock_server.get_ticker_data(symbol)
-        if data is not None:
-            return jsonify({
-                'symbol': symbol.upper(),
-                'record_count': len(data),
-                'data': data
-            })
+        since = request.args.get('since')
+        limit = request.args.get('limit')
+        if limit is not None:
+            if not limit.isdigit() or int(limit) < 1:
+                return json_response({'error': 'limit must be a positive integer'}), 400
+            limit = int(limit)
+        result = stock_server.get_ticker_data(symbol, since, limit)
+        if result is not None:
+            # data is already a snapshot, so the collector can keep appending while this streams
+            data, total_count = result
+            return Response(stream_ticker_data(symbol, data, total_count), mimetype='application/json')
         else:
-            return jsonify({'error': f'Ticker {symbol.upper()} not found'}), 404
+            return json_response({'error': f'Ticker {symbol} not found'}), 404
     except Exception as e:
         logger.error(f"Error getting ticker data: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/data/<symbol>/latest', methods=['GET'])
 def get_latest_data(symbol):
@@ -466,62 +679,62 @@ def get_latest_data(symbol):
     try:
         data = stock_server.get_latest_data(symbol)
         if data is not None:
-            return jsonify(data)
+            return json_response(data)
         else:
-            return jsonify({'error': f'No data available for ticker {symbol.upper()}'}), 404
+            return json_response({'error': f'No data available for ticker {symbol}'}), 404
     except Exception as e:
         logger.error(f"Error getting latest data: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/market-status', methods=['GET'])
 def get_market_status():
     """Get current market status"""
     try:
-        return jsonify(stock_server.get_market_status())
+        return json_response(stock_server.get_market_status())
     except Exception as e:
         logger.error(f"Error getting market status: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/status', methods=['GET'])
 def get_status():
     """Get server status"""
     try:
         market_status = stock_server.get_market_status()
-        return jsonify({
+        return json_response({
             'running': stock_server.running,
             'market_open': market_status['is_open'],
             'market_message': market_status['message'],
             'current_et_time': market_status['current_et_time'],
             'current_local_time': market_status['current_local_time'],
             'tickers_count': len(stock_server.tickers),
-            'current_ticker_index': stock_server.current_ticker_index,
+            'quote_batch_size': stock_server.quote_batch_size,
             'max_records_per_ticker': stock_server.max_records,
             'request_interval_seconds': stock_server.request_interval,
             'last_cleanup_date': str(stock_server.last_cleanup_date) if stock_server.last_cleanup_date else None
         })
     except Exception as e:
         logger.error(f"Error getting status: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/start', methods=['POST'])
 def start_collection():
     """Start data collection"""
     try:
         stock_server.start()
-        return jsonify({'message': 'Data collection started'})
+        return json_response({'message': 'Data collection started'})
     except Exception as e:
         logger.error(f"Error starting collection: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/stop', methods=['POST'])
 def stop_collection():
     """Stop data collection"""
     try:
         stock_server.stop()
-        return jsonify({'message': 'Data collection stopped'})
+        return json_response({'message': 'Data collection stopped'})
     except Exception as e:
         logger.error(f"Error stopping collection: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 @app.route('/cleanup', methods=['POST'])
 def manual_cleanup():
@@ -529,10 +742,10 @@ def manual_cleanup():
     try:
         stock_server.last_cleanup_date = None  # Force cleanup
         stock_server.cleanup_old_records()
-        return jsonify({'message': 'Manual cleanup completed'})
+        return json_response({'message': 'Manual cleanup completed'})
     except Exception as e:
         logger.error(f"Error during cleanup: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500
+        return json_response({'error': 'Internal server error'}), 500
 
 if __name__ == '__main__':
     # Start data collection